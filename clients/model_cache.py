@@ -0,0 +1,136 @@
+import os
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 摘要缓存的 SQLite 文件
+DEFAULT_CACHE_PATH = ".cache/llm_cache/cache.sqlite"
+# 条目的有效期（秒）与最多保留的条数，超出的旧条目在写入时清理
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+def model_name(model_client) -> str:
+    """读取模型客户端配置中的模型名称，读不到时返回空字符串"""
+    return getattr(model_client, "_raw_config", {}).get("model", "")
+
+def make_cache_key(model: str, messages: list[tuple[str, str]], tools: list[str] = ()) -> str:
+    """根据模型、消息和工具列表计算内容寻址的缓存键
+
+    Args:
+        model (str): 模型名称
+        messages (list[tuple[str, str]]): (role, content) 列表
+        tools (list[str]): 可用工具的名称
+
+    Returns:
+        str: SHA-256 十六进制摘要
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [{"role": role, "content": content} for role, content in messages],
+            "tools": sorted(tools),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """基于 SQLite 的 LLM 响应缓存
+
+    只应用于没有副作用的调用（例如对话摘要）：相同输入直接返回上次的结果，
+    不再请求模型。会调用工具的请求不能缓存，否则会跳过真实的任务操作。
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            path (str): SQLite 数据库文件路径
+            ttl (float): 条目的有效期（秒），过期后视为未命中并在下次写入时删除
+            max_entries (int): 最多保留的条目数，超出时删除最早写入的条目
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS summaries_created_at ON summaries (created_at)")
+        # 旧版本不带写入时间、从不清理的表
+        self._conn.execute("DROP TABLE IF EXISTS responses")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取未过期的缓存响应，未命中时返回 None
+
+        同步执行 SQLite 查询，在事件循环中应通过 asyncio.to_thread 调用。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM summaries WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        if row is not None:
+            logger.debug("LLM cache hit: %s", key[:12])
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """写入响应，并清理过期和超出数量上限的条目
+
+        同步执行 SQLite 写入，在事件循环中应通过 asyncio.to_thread 调用。
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, now)
+            )
+            self._conn.execute("DELETE FROM summaries WHERE created_at <= ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key NOT IN "
+                "(SELECT key FROM summaries ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+_shared_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> LLMCache:
+    """获取进程内共享的 LLM 缓存（首次调用时创建）"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = LLMCache()
+    return _shared_cache
+
+# 模型补全缓存的目录，与上面的摘要缓存分开存放
+COMPLETION_CACHE_DIR = ".cache/llm_cache/completions"
+
+def cached_model_client(model_client, directory: str = COMPLETION_CACHE_DIR):
+    """用磁盘缓存包装模型客户端，相同的请求（消息、工具、参数）直接返回上次的补全
+
+    基于 autogen 自带的 ChatCompletionCache，适合测试和命令行脚本的重复运行；
+    只缓存模型的补全，工具调用仍会真实执行。
+
+    Args:
+        model_client: 被包装的 ChatCompletionClient
+        directory (str): diskcache 目录
+
+    Returns:
+        ChatCompletionCache: 带缓存的模型客户端
+    """
+    import diskcache
+    from autogen_ext.cache_store.diskcache import DiskCacheStore
+    from autogen_ext.models.cache import ChatCompletionCache
+
+    return ChatCompletionCache(model_client, DiskCacheStore(diskcache.Cache(directory)))
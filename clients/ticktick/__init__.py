@@ -1,3 +1,4 @@
 from .client import TickTickClient
+from .async_client import AsyncTickTickClient
 
-__all__ = ["TickTickClient"]
+__all__ = ["TickTickClient", "AsyncTickTickClient"]
@@ -0,0 +1,88 @@
+import asyncio
+
+from .client import TickTickClient
+
+
+class AsyncTickTickClient:
+    """TickTickClient 的异步封装
+
+    TickTick 没有批量接口，逐个调用 create_task/update_task/delete_task 时每次都要
+    等待一个完整的往返。这里把同步客户端的调用放到线程中执行（共享同一个
+    HTTP 连接池），并用信号量限制并发数，从而可以并发提交大量变更。
+    """
+
+    def __init__(self, client: TickTickClient, max_concurrency: int = None):
+        """
+        Args:
+            client (TickTickClient): 已认证的同步客户端
+            max_concurrency (int, optional): 最大并发请求数，默认与客户端连接池大小一致
+        """
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency or client.max_workers)
+
+    async def _run(self, func, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def create_task(self, title: str, **kwargs) -> dict:
+        """创建新任务，参数同 TickTickClient.create_task"""
+        return await self._run(self.client.create_task, title, **kwargs)
+
+    async def update_task(self, task_id: str, updates: dict) -> dict:
+        """更新任务，参数同 TickTickClient.update_task"""
+        return await self._run(self.client.update_task, task_id, updates)
+
+    async def delete_task(self, task_id: str) -> None:
+        """删除任务"""
+        return await self._run(self.client.delete_task, task_id)
+
+    async def complete_task(self, task_id: str) -> None:
+        """完成任务"""
+        return await self._run(self.client.complete_task, task_id)
+
+    async def create_tasks(self, specs: list[dict]) -> list:
+        """并发创建多个任务
+
+        Args:
+            specs (list[dict]): 每个元素为 create_task 的关键字参数，必须包含 title
+
+        Returns:
+            list: 与 specs 顺序一致的结果列表，失败的项为对应的异常对象
+        """
+        # 预先创建缺失的项目，避免并发创建同名项目
+        project_names = {spec['project_name'] for spec in specs if spec.get('project_name')}
+        if project_names:
+            await asyncio.to_thread(self.client.load_projects)
+            for name in project_names:
+                if name.lower() not in self.client._projects_by_lname:
+                    await asyncio.to_thread(self.client.create_project, name)
+
+        return await asyncio.gather(
+            *(self.create_task(**spec) for spec in specs),
+            return_exceptions=True
+        )
+
+    async def update_tasks(self, updates: dict[str, dict]) -> list:
+        """并发更新多个任务
+
+        Args:
+            updates (dict[str, dict]): task_id -> 需要更新的字段
+
+        Returns:
+            list: 与 updates 顺序一致的结果列表，失败的项为对应的异常对象
+        """
+        return await asyncio.gather(
+            *(self.update_task(task_id, fields) for task_id, fields in updates.items()),
+            return_exceptions=True
+        )
+
+    async def delete_tasks(self, task_ids: list[str]) -> list:
+        """并发删除多个任务
+
+        Returns:
+            list: 与 task_ids 顺序一致的结果列表，失败的项为对应的异常对象
+        """
+        return await asyncio.gather(
+            *(self.delete_task(task_id) for task_id in task_ids),
+            return_exceptions=True
+        )
@@ -2,7 +2,7 @@ from .client import TickTickClient
 from dotenv import load_dotenv
 import os
 import time
-import requests
+import httpx
 
 def main():
     # 加载环境变量
@@ -23,6 +23,11 @@ def main():
         redirect_uri=redirect_uri
     )
     
+    # 已有有效令牌（必要时已自动刷新）时无需重新走浏览器授权
+    if client.access_token:
+        print('已存在有效的访问令牌，跳过认证')
+        return
+    
     # 运行认证流程
     max_retries = 3
     retry_delay = 5
@@ -36,7 +41,7 @@ def main():
             try:
                 client.load_projects()
                 return  # 如果成功加载项目，则认证成功
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 if e.response.status_code == 401:
                     print('认证失败: 无效的访问令牌')
                 else:
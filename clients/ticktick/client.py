@@ -1,29 +1,86 @@
-import requests
+import httpx
 from urllib.parse import urlencode
 import http.server
-import socketserver
+import socket
 import webbrowser
 from urllib.parse import parse_qs, urlparse
 import threading
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库 json
+    orjson = None
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# 仅有日期（YYYY-MM-DD）时补全的时间部分
+_MIDNIGHT_SUFFIX = 'T00:00:00.000Z'
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+# 旧版本保存在当前工作目录下的令牌文件
+_LEGACY_TOKEN_FILE = 'ticktick_token.json'
+
+
+def _default_token_file():
+    """令牌文件的默认位置
+
+    保存在用户缓存目录（$XDG_CACHE_HOME/ticktick/token.json）下，不随工作目录变化，
+    从任意目录运行脚本或测试都能复用同一个令牌；当前目录下已有旧的令牌文件时继续使用它。
+    """
+    if os.path.exists(_LEGACY_TOKEN_FILE):
+        return _LEGACY_TOKEN_FILE
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'ticktick', 'token.json')
+
+
+def _json_body(payload):
+    """序列化请求体，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload)
+
+
+def _json_response(response):
+    """解析响应体，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 class OAuthCallbackHandler(http.server.SimpleHTTPRequestHandler):
-    auth_code = None
-    
     def do_GET(self):
-        """处理回调请求"""
+        """处理回调请求
+        
+        授权码写入 ``self.server.auth_code``，并通过 ``self.server.auth_event``
+        通知等待中的 ``authenticate()``。
+        """
         query_components = parse_qs(urlparse(self.path).query)
         
         # 获取授权码
         if 'code' in query_components:
-            OAuthCallbackHandler.auth_code = query_components['code'][0]
-            # 发送成功响应
+            # 发送成功响应，并在通知主线程之前关闭写端，让浏览器立即结束请求
+            body = b"Authorization successful! You can close this window."
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Connection', 'close')
             self.end_headers()
-            self.wfile.write(b"Authorization successful! You can close this window.")
+            self.wfile.write(body)
+            self.wfile.flush()
+            try:
+                self.connection.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self.close_connection = True
+            self.server.auth_code = query_components['code'][0]
+            self.server.auth_event.set()
         else:
             self.send_response(400)
             self.send_header('Content-type', 'text/html')
@@ -31,6 +88,9 @@ class OAuthCallbackHandler(http.server.SimpleHTTPRequestHandler):
             self.wfile.write(b"Authorization failed! No code received.")
 
 class TickTickClient:
+    # 进程内令牌缓存：token_file -> (文件 mtime, 令牌信息)，避免每次构造客户端都重新解析文件
+    _token_cache = {}
+    
     def __init__(self, client_id, client_secret, redirect_uri='http://localhost:8080/callback'):
         self.client_id = client_id
         self.client_secret = client_secret
@@ -39,9 +99,29 @@ class TickTickClient:
         self.auth_url = 'https://ticktick.com/oauth/authorize'
         self.token_url = 'https://ticktick.com/oauth/token'
         self.access_token = None
-        self.token_file = 'ticktick_token.json'
+        self._refresh_token = None
+        self._expires_at = None  # 访问令牌过期时间（datetime）
+        self._token_lock = threading.Lock()  # 防止并发请求重复刷新令牌
+        self.refresh_margin = 300  # 距离过期不足该秒数时提前刷新令牌
+        self.token_file = _default_token_file()
         self.projects = {}  # 缓存项目信息
+        self._projects_by_lname = {}  # 小写项目名 -> 项目 ID 索引
         self.inbox_id = None  # 存储 Inbox ID
+        self.max_workers = 16  # 并发请求的最大线程数，与连接池大小一致
+        self._task_to_project = {}  # 缓存 task_id -> project_id，避免逐个项目查找任务
+        self._projects_fetched_at = 0.0  # 项目列表上次成功加载的时间（monotonic）
+        self._projects_ttl = 60.0  # 项目列表缓存有效期（秒）
+        # 复用同一个 HTTP 客户端，避免每次请求都重新建立 TCP/TLS 连接；
+        # 启用 HTTP/2 时并发请求在同一条连接上多路复用。
+        # 建立连接失败（连接被拒绝、超时等）时自动重试，此时请求尚未发出，重试是安全的
+        self.session = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=self.max_workers),
+                retries=3
+            ),
+            timeout=30.0
+        )
         self.load_token()
         if self.access_token:
             self.load_projects()
@@ -67,6 +147,7 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
         # 确保项目列表是最新的
         self.load_projects()
@@ -74,10 +155,7 @@ class TickTickClient:
         # 确定项目 ID
         project_id = self.inbox_id
         if project_name:
-            project_id = next(
-                (p['id'] for p in self.projects.values() if p['name'].lower() == project_name.lower()),
-                None
-            )
+            project_id = self._projects_by_lname.get(project_name.lower())
             if not project_id:
                 # 如果项目不存在，创建新项目
                 project = self.create_project(project_name)
@@ -87,10 +165,6 @@ class TickTickClient:
             raise ValueError('No project ID available. Make sure you are authenticated and have access to projects.')
             
         url = f'{self.base_url}/task'
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
         
         task_data = {
             'title': title,
@@ -105,12 +179,12 @@ class TickTickClient:
         if due_date:
             # 如果只提供了日期部分，添加时间部分
             if len(due_date) == 10:  # YYYY-MM-DD 格式
-                due_date = f"{due_date}T00:00:00.000Z"
+                due_date += _MIDNIGHT_SUFFIX
             task_data['dueDate'] = due_date
             
         if start_date:
             if len(start_date) == 10:  # YYYY-MM-DD 格式
-                start_date = f"{start_date}T00:00:00.000Z"
+                start_date += _MIDNIGHT_SUFFIX
             task_data['startDate'] = start_date
             
         # 处理提醒
@@ -121,10 +195,11 @@ class TickTickClient:
         if repeat:
             task_data['repeat'] = repeat
             
-        response = requests.post(url, headers=headers, json=task_data)
+        response = self.session.post(url, content=_json_body(task_data), headers=_JSON_HEADERS)
         
         if response.status_code in [200, 201]:
-            task_data = response.json()
+            task_data = _json_response(response)
+            self._task_to_project[task_data['id']] = task_data['projectId']
             # 如果是 Inbox 任务，保存 Inbox ID
             if not project_name and not self.inbox_id:
                 self.inbox_id = task_data['projectId']
@@ -149,18 +224,14 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
-        headers = {'Authorization': f'Bearer {self.access_token}'}
-        
         # 确保项目列表是最新的
         self.load_projects()
         
         if project_name:
             # 获取指定项目的任务
-            project_id = next(
-                (p['id'] for p in self.projects.values() if p['name'].lower() == project_name.lower()),
-                None
-            )
+            project_id = self._projects_by_lname.get(project_name.lower())
             if not project_id:
                 raise ValueError(f'Project {project_name} not found')
                 
@@ -176,11 +247,22 @@ class TickTickClient:
                 }
             return tasks
         else:
-            # 获取所有项目的任务
+            # 并发获取所有项目的任务
             all_tasks = []
-            for project in self.projects.values():
-                try:
-                    project_data = self.get_project_data(project['id'])
+            if not self.projects:
+                return all_tasks
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.projects))) as executor:
+                futures = {
+                    executor.submit(self.get_project_data, project['id']): project
+                    for project in self.projects.values()
+                }
+                for future in as_completed(futures):
+                    project = futures[future]
+                    try:
+                        project_data = future.result()
+                    except Exception as e:
+                        print(f"Warning: Failed to get tasks for project {project['name']}: {e}")
+                        continue
                     tasks = project_data.get('tasks', [])
                     # 添加项目信息到任务中
                     for task in tasks:
@@ -190,9 +272,6 @@ class TickTickClient:
                             'isInbox': project.get('isInbox', False)
                         }
                     all_tasks.extend(tasks)
-                except Exception as e:
-                    print(f"Warning: Failed to get tasks for project {project['name']}: {e}")
-                    continue
             return all_tasks
     
     def update_task(self, task_id, updates):
@@ -217,18 +296,10 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
         # 先获取现有任务信息
-        task = None
-        project_id = None
-        for project in self.projects.values():
-            try:
-                task = self.get_task_by_id(project['id'], task_id)
-                if task:
-                    project_id = project['id']
-                    break
-            except:
-                continue
+        project_id, task = self._find_task(task_id)
                 
         if not task:
             raise ValueError(f'Task not found: {task_id}')
@@ -250,15 +321,11 @@ class TickTickClient:
         
         # 发送更新请求
         url = f'{self.base_url}/task/{task_id}'
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
         
-        response = requests.post(url, headers=headers, json=update_data)
+        response = self.session.post(url, content=_json_body(update_data), headers=_JSON_HEADERS)
         
         if response.status_code in [200, 201]:
-            return response.json()
+            return _json_response(response)
         elif response.status_code == 401:
             raise Exception('Unauthorized: Invalid access token')
         elif response.status_code == 404:
@@ -274,25 +341,18 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
         # 先获取任务所属的项目
-        project_id = None
-        for project in self.projects.values():
-            try:
-                task = self.get_task_by_id(project['id'], task_id)
-                if task:
-                    project_id = project['id']
-                    break
-            except:
-                continue
+        project_id = self._task_to_project.get(task_id) or self._find_task(task_id)[0]
                 
         if not project_id:
             raise ValueError(f'Task not found: {task_id}')
             
         url = f'{self.base_url}/project/{project_id}/task/{task_id}'
-        headers = {'Authorization': f'Bearer {self.access_token}'}
         
-        response = requests.delete(url, headers=headers)
+        response = self.session.delete(url)
+        self._task_to_project.pop(task_id, None)
         
         if response.status_code not in [200, 201, 204]:
             if response.status_code == 401:
@@ -310,25 +370,17 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
         # 先获取任务所属的项目
-        project_id = None
-        for project in self.projects.values():
-            try:
-                task = self.get_task_by_id(project['id'], task_id)
-                if task:
-                    project_id = project['id']
-                    break
-            except:
-                continue
+        project_id = self._task_to_project.get(task_id) or self._find_task(task_id)[0]
                 
         if not project_id:
             raise ValueError(f'Task not found: {task_id}')
             
         url = f'{self.base_url}/project/{project_id}/task/{task_id}/complete'
-        headers = {'Authorization': f'Bearer {self.access_token}'}
         
-        response = requests.post(url, headers=headers)
+        response = self.session.post(url)
         
         if response.status_code not in [200, 201]:
             if response.status_code == 401:
@@ -338,21 +390,33 @@ class TickTickClient:
             else:
                 raise Exception(f'Error completing task: {response.status_code} - {response.text}')
         
-    def load_projects(self):
-        """加载所有项目信息"""
+    def load_projects(self, force=False):
+        """加载所有项目信息
+        
+        项目列表在 ``_projects_ttl`` 秒内视为有效，期间重复调用不会再次请求。
+        
+        Args:
+            force (bool): 是否忽略缓存强制重新加载
+        """
         if not self.access_token:
             return
+        self._refresh_if_needed()
+            
+        if (not force and self.projects
+                and time.monotonic() - self._projects_fetched_at < self._projects_ttl):
+            return
             
         url = f'{self.base_url}/project'
-        headers = {'Authorization': f'Bearer {self.access_token}'}
         
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url)
             response.raise_for_status()
-            projects = response.json()
+            projects = _json_response(response)
             
             # 将项目信息存储在字典中
             self.projects = {p['id']: p for p in projects}
+            self._projects_by_lname = {p['name'].lower(): p['id'] for p in projects}
+            self._projects_fetched_at = time.monotonic()
             
             # 设置 Inbox ID
             inbox = next((p for p in projects if p.get('kind') == 'INBOX'), None)
@@ -375,12 +439,9 @@ class TickTickClient:
         """
         if not self.access_token:
             raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
             
         url = f'{self.base_url}/project'
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
         
         project_data = {
             'name': name,
@@ -390,14 +451,45 @@ class TickTickClient:
         if color:
             project_data['color'] = color
         
-        response = requests.post(url, headers=headers, json=project_data)
+        response = self.session.post(url, content=_json_body(project_data), headers=_JSON_HEADERS)
         response.raise_for_status()
         
         # 更新项目缓存
-        project = response.json()
+        project = _json_response(response)
         self.projects[project['id']] = project
+        self._projects_by_lname[project['name'].lower()] = project['id']
         return project
         
+    def delete_project(self, project_id):
+        """删除项目（连同其中的任务）
+        
+        Args:
+            project_id (str): 项目ID
+        """
+        if not self.access_token:
+            raise ValueError('Not authenticated. Please authenticate first.')
+        self._refresh_if_needed()
+            
+        url = f'{self.base_url}/project/{project_id}'
+        
+        response = self.session.delete(url)
+        
+        if response.status_code not in [200, 201, 204]:
+            if response.status_code == 401:
+                raise Exception('Unauthorized: Invalid access token')
+            elif response.status_code == 404:
+                raise Exception(f'Project not found: {project_id}')
+            else:
+                raise Exception(f'Error deleting project: {response.status_code} - {response.text}')
+                
+        # 更新项目缓存
+        project = self.projects.pop(project_id, None)
+        if project:
+            self._projects_by_lname.pop(project['name'].lower(), None)
+        self._task_to_project = {
+            task_id: pid for task_id, pid in self._task_to_project.items() if pid != project_id
+        }
+        
     def save_inbox_id(self):
         """保存 Inbox ID 到文件"""
         if self.inbox_id:
@@ -414,41 +506,111 @@ class TickTickClient:
             'access_token': token_data['access_token'],
             'expires_at': (datetime.now() + timedelta(seconds=token_data['expires_in'])).isoformat(),
             'token_type': token_data['token_type'],
-            'scope': token_data['scope']
+            'scope': token_data.get('scope')
         }
+        if token_data.get('refresh_token'):
+            token_info['refresh_token'] = token_data['refresh_token']
         
-        with open(self.token_file, 'w') as f:
+        # 先写临时文件再替换，保证其他读取方不会读到半写入的文件；令牌只允许当前用户读写
+        os.makedirs(os.path.dirname(self.token_file) or '.', exist_ok=True)
+        tmp_file = f'{self.token_file}.tmp'
+        with open(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
             json.dump(token_info, f, indent=2)
+        os.replace(tmp_file, self.token_file)
+        TickTickClient._token_cache[self.token_file] = (os.stat(self.token_file).st_mtime, token_info)
         
         self.access_token = token_data['access_token']
+        self._refresh_token = token_info.get('refresh_token')
+        self._expires_at = datetime.fromisoformat(token_info['expires_at'])
+        self._update_auth_header()
+        
+    def _update_auth_header(self):
+        """将当前访问令牌设置为 Session 的默认 Authorization 头"""
+        self.session.headers['Authorization'] = f'Bearer {self.access_token}'
+        
+    def _refresh_if_needed(self):
+        """令牌将在 ``refresh_margin`` 秒内过期且存在 refresh_token 时提前刷新"""
+        if not self._refresh_token or self._expires_at is None:
+            return
+        if (self._expires_at - datetime.now()).total_seconds() > self.refresh_margin:
+            return
+        with self._token_lock:
+            # 其他线程可能已经完成了刷新
+            if (self._expires_at - datetime.now()).total_seconds() > self.refresh_margin:
+                return
+            self.refresh_access_token()
+            
+    def refresh_access_token(self):
+        """使用 refresh_token 获取新的访问令牌并保存
         
+        Returns:
+            dict: 令牌端点返回的数据
+        """
+        if not self._refresh_token:
+            raise Exception('No refresh token available. Please authenticate first.')
+            
+        data = {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'grant_type': 'refresh_token',
+            'refresh_token': self._refresh_token
+        }
+        response = self._post_token(data)
+        if response.status_code == 200:
+            token_data = response.json()
+            # 部分响应不会返回新的 refresh_token，沿用旧的
+            token_data.setdefault('refresh_token', self._refresh_token)
+            self.save_token(token_data)
+            return token_data
+        else:
+            raise Exception(f'Error refreshing access token: {response.status_code} - {response.text}')
+            
     def load_token(self):
-        """从文件加载访问令牌"""
-        if not os.path.exists(self.token_file):
+        """从文件加载访问令牌
+        
+        文件未变化（mtime 相同）时直接使用进程内缓存的解析结果。
+        """
+        try:
+            mtime = os.stat(self.token_file).st_mtime
+        except FileNotFoundError:
             return False
             
         try:
-            with open(self.token_file, 'r') as f:
-                token_info = json.load(f)
+            cached = self._token_cache.get(self.token_file)
+            if cached and cached[0] == mtime:
+                token_info = cached[1]
+            else:
+                with open(self.token_file, 'r') as f:
+                    token_info = json.load(f)
+                TickTickClient._token_cache[self.token_file] = (mtime, token_info)
                 
             # 检查令牌是否过期
             expires_at = datetime.fromisoformat(token_info['expires_at'])
+            self._refresh_token = token_info.get('refresh_token')
             if datetime.now() < expires_at:
                 self.access_token = token_info['access_token']
+                self._expires_at = expires_at
+                self._update_auth_header()
+                return True
+            elif self._refresh_token:
+                # 已过期但有 refresh_token，直接刷新而无需重新走浏览器授权
+                self.refresh_access_token()
                 return True
             else:
                 os.remove(self.token_file)  # 删除过期的令牌文件
+                TickTickClient._token_cache.pop(self.token_file, None)
                 return False
         except Exception as e:
             print(f"加载令牌时出错: {e}")
             return False
             
-    def authenticate(self, port=8080, force_new=False):
+    def authenticate(self, port=8080, force_new=False, timeout=300):
         """完整的认证流程
         
         Args:
             port (int): 本地服务器端口号
             force_new (bool): 是否强制获取新的令牌，即使现有令牌仍然有效
+            timeout (float): 等待浏览器回调的最长时间（秒）
         """
         # 如果不是强制刷新，且已有有效的访问令牌，则直接返回
         if not force_new and self.access_token:
@@ -456,12 +618,12 @@ class TickTickClient:
             
         redirect_uri = f'http://localhost:{port}'
         
-        # 重置授权码
-        OAuthCallbackHandler.auth_code = None
-        
-        # 启动本地服务器
-        server = socketserver.TCPServer(("", port), OAuthCallbackHandler)
-        server.timeout = 60  # 设置超时时间为60秒
+        # 在后台线程启动本地服务器，回调到达时通过 Event 通知
+        server = http.server.ThreadingHTTPServer(("", port), OAuthCallbackHandler)
+        server.auth_code = None
+        server.auth_event = threading.Event()
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
         
         # 获取授权URL并打开浏览器
         auth_url = self.get_auth_url(redirect_uri)
@@ -472,14 +634,16 @@ class TickTickClient:
         print(f"\n等待授权中... 请在浏览器中完成授权")
         
         # 等待回调
-        while OAuthCallbackHandler.auth_code is None:
-            server.handle_request()
-        
-        # 关闭服务器
-        server.server_close()
+        try:
+            server.auth_event.wait(timeout=timeout)
+        finally:
+            # 关闭服务器
+            server.shutdown()
+            server.server_close()
+            server_thread.join()
         
         # 获取授权码
-        auth_code = OAuthCallbackHandler.auth_code
+        auth_code = server.auth_code
         
         if auth_code:
             print("\n成功获取授权码！正在获取访问令牌...")
@@ -503,6 +667,12 @@ class TickTickClient:
             params['state'] = state
         return f"{self.auth_url}?{urlencode(params)}"
     
+    def _post_token(self, data):
+        """向令牌端点提交表单，不携带旧的 Bearer 头"""
+        request = self.session.build_request('POST', self.token_url, data=data)
+        request.headers.pop('Authorization', None)
+        return self.session.send(request)
+        
     def get_access_token(self, code, redirect_uri):
         """使用授权码获取访问令牌"""
         data = {
@@ -512,7 +682,7 @@ class TickTickClient:
             'grant_type': 'authorization_code',
             'redirect_uri': redirect_uri
         }
-        response = requests.post(self.token_url, data=data)
+        response = self._post_token(data)
         if response.status_code == 200:
             token_data = response.json()
             return token_data
@@ -523,11 +693,11 @@ class TickTickClient:
         """获取项目列表"""
         if not self.access_token:
             raise Exception('Access token not set. Please authenticate first.')
+        self._refresh_if_needed()
             
-        headers = {'Authorization': f'Bearer {self.access_token}'}
-        response = requests.get('https://api.ticktick.com/open/v1/project', headers=headers)
+        response = self.session.get(f'{self.base_url}/project')
         if response.status_code == 200:
-            return response.json()
+            return _json_response(response)
         else:
             raise Exception(f'Error fetching projects: {response.status_code} - {response.text}')
 
@@ -545,13 +715,16 @@ class TickTickClient:
         """
         if not self.access_token:
             raise Exception('Access token not set. Please authenticate first.')
+        self._refresh_if_needed()
             
-        headers = {'Authorization': f'Bearer {self.access_token}'}
-        url = f'https://api.ticktick.com/open/v1/project/{project_id}/data'
+        url = f'{self.base_url}/project/{project_id}/data'
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url)
         if response.status_code == 200:
-            return response.json()
+            project_data = _json_response(response)
+            for task in project_data.get('tasks', []):
+                self._task_to_project[task['id']] = project_id
+            return project_data
         elif response.status_code == 404:
             raise Exception(f'Project not found: project_id={project_id}')
         elif response.status_code == 401:
@@ -561,12 +734,14 @@ class TickTickClient:
         else:
             raise Exception(f'Error fetching project data: {response.status_code} - {response.text}')
 
-    def get_task_by_id(self, project_id: str, task_id: str):
+    def get_task_by_id(self, project_id: str, task_id: str, forbidden_as_missing: bool = False):
         """获取特定项目中的特定任务
         
         Args:
             project_id (str): 项目ID
             task_id (str): 任务ID
+            forbidden_as_missing (bool): 无权访问（403）时返回 None 而不是抛出异常，
+                用于在所有项目中探测任务
             
         Returns:
             dict: 任务详情，包含以下字段：
@@ -583,66 +758,108 @@ class TickTickClient:
                 - status: 状态（0：正常，2：已完成）
                 - completedTime: 完成时间
                 - items: 子任务列表
+            任务不存在（404）时返回 None；其他错误仍会抛出异常。
         """
         if not self.access_token:
             raise Exception('Access token not set. Please authenticate first.')
+        self._refresh_if_needed()
             
-        headers = {'Authorization': f'Bearer {self.access_token}'}
-        url = f'https://api.ticktick.com/open/v1/project/{project_id}/task/{task_id}'
+        url = f'{self.base_url}/project/{project_id}/task/{task_id}'
         
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url)
         if response.status_code == 200:
-            return response.json()
+            return _json_response(response)
         elif response.status_code == 404:
-            raise Exception(f'Task not found: project_id={project_id}, task_id={task_id}')
+            return None
         elif response.status_code == 401:
             raise Exception('Unauthorized: Invalid access token')
         elif response.status_code == 403:
+            if forbidden_as_missing:
+                return None
             raise Exception('Forbidden: No permission to access this task')
         else:
             raise Exception(f'Error fetching task: {response.status_code} - {response.text}')
 
+    def _find_task(self, task_id):
+        """查找任务及其所属项目
+        
+        优先使用 task_id -> project_id 缓存；未命中时并发探测所有项目，
+        取第一个返回结果并写入缓存。
+        
+        Args:
+            task_id (str): 任务ID
+            
+        Returns:
+            tuple: (project_id, task)，找不到时返回 (None, None)
+        """
+        project_id = self._task_to_project.get(task_id)
+        if project_id:
+            task = self.get_task_by_id(project_id, task_id)
+            if task:
+                return project_id, task
+            # 缓存已失效（任务被移动或删除），回退到全量查找
+            self._task_to_project.pop(task_id, None)
+                
+        if not self.projects:
+            return None, None
+            
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.projects)))
+        futures = {
+            # 某个项目无权访问（如共享项目）只说明任务不在其中，不应中断整个查找
+            executor.submit(self.get_task_by_id, project['id'], task_id, forbidden_as_missing=True): project['id']
+            for project in self.projects.values()
+        }
+        try:
+            for future in as_completed(futures):
+                task = future.result()
+                if task:
+                    project_id = futures[future]
+                    self._task_to_project[task_id] = project_id
+                    return project_id, task
+        finally:
+            # 找到后不再等待其余探测请求
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None, None
+
     def _get_inbox_id(self):
         """获取用户的 Inbox ID
         
         通过创建一个临时任务到 Inbox 来获取实际的 Inbox ID，
         然后删除这个临时任务。
         
+        已弃用：需要两次额外请求且会在用户账户中产生副作用。
+        Inbox ID 通常由 ``load_projects`` 获得，本方法仅作为最后的回退手段。
+        
         Returns:
             str: Inbox ID
         """
         if not self.access_token:
             raise Exception('Access token not set. Please authenticate first.')
+        self._refresh_if_needed()
             
         # 创建一个临时任务到 Inbox
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
-        
         temp_task = {
             'title': '_temp_task_for_inbox_id',
             'projectId': 'inbox'
         }
         
         # 创建临时任务
-        create_response = requests.post(
-            'https://api.ticktick.com/open/v1/task',
-            headers=headers,
-            json=temp_task
+        create_response = self.session.post(
+            f'{self.base_url}/task',
+            content=_json_body(temp_task),
+            headers=_JSON_HEADERS
         )
         
         if create_response.status_code not in [200, 201]:
             raise Exception(f'Error creating temp task: {create_response.status_code} - {create_response.text}')
             
         # 从响应中获取 Inbox ID
-        task_data = create_response.json()
+        task_data = _json_response(create_response)
         inbox_id = task_data['projectId']
         
         # 删除临时任务
-        delete_response = requests.delete(
-            f'https://api.ticktick.com/open/v1/project/{inbox_id}/task/{task_data["id"]}',
-            headers=headers
+        delete_response = self.session.delete(
+            f'{self.base_url}/project/{inbox_id}/task/{task_data["id"]}'
         )
         
         if delete_response.status_code not in [200, 204]:
@@ -658,8 +875,12 @@ class TickTickClient:
         """
         if not self.access_token:
             raise Exception('Access token not set. Please authenticate first.')
+        self._refresh_if_needed()
             
-        # 如果还没有获取过 Inbox ID，先获取它
+        # 如果还没有获取过 Inbox ID，先从项目列表中查找
+        if not self.inbox_id:
+            self.load_projects()
+        # 项目列表中没有 Inbox 时才回退到创建临时任务的方式
         if not self.inbox_id:
             self.inbox_id = self._get_inbox_id()
             
@@ -1,19 +1,14 @@
 import os
 import logging
 import uvicorn
-from fastapi import FastAPI, WebSocket
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.middleware.cors import CORSMiddleware
-import openai
 from dotenv import load_dotenv
-from server.session_handler import SessionHandler
+from server.app import create_app
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logger = logging.getLogger(__name__)
+# Configure logging for the server package
+logger = logging.getLogger("server")
 logger.setLevel(logging.INFO)
 
 # Create console handler with formatting
@@ -30,62 +25,28 @@ logger.propagate = False
 
 # 配置选项
 USE_DIRECT_AGENT = os.getenv("USE_DIRECT_AGENT", "false").lower() == "true"
-logger.info(f"Using direct agent mode: {USE_DIRECT_AGENT}")
-
-# Initialize FastAPI app
-app = FastAPI()
-
-# Add CORS support
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-# Set up OpenAI
-openai.api_key = os.getenv('OPENAI_API_KEY')
-if not openai.api_key:
+logger.info("Using direct agent mode: %s", USE_DIRECT_AGENT)
+WS_MAX_SIZE = 2_000_000  # WebSocket 单帧上限（字节），足够容纳一段语音的 base64 数据
+# permessage-deflate：代理回复和合并帧是冗余度很高的文本，压缩能明显减少传输量；
+# 代价是每个连接的 zlib 缓冲区和压缩 CPU，在局域网部署时可设为 false 关闭
+WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+
+# OpenAI 客户端会从环境变量读取密钥，这里只做启动时校验
+if not os.getenv('OPENAI_API_KEY'):
     raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-# WebSocket endpoint
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-
-    client_id = id(websocket)
-    logger.info(f"New WebSocket connection: {client_id}")
-    
-    # 为每个连接创建一个新的SessionHandler实例，并设置代理模式
-    session_handler = SessionHandler(use_direct_agent=USE_DIRECT_AGENT)
-    await session_handler.initialize()
-
-    try:
-        while True:
-            # Receive data
-            data = await websocket.receive_text()
-            
-            # Handle message with this connection's session handler
-            status, message = await session_handler.handle_message(data)
-            
-            # Send response
-            if status and message:
-                await websocket.send_text(f"[{status}] {message}")
-    except Exception as e:
-        logger.error(f"WebSocket error for client {client_id}: {e}", exc_info=True)
-    finally:
-        logger.info(f"WebSocket connection closed: {client_id}")
-
-# Root route
-@app.get("/")
-async def root():
-    return FileResponse("static/asr.html")
+# Initialize FastAPI app
+app = create_app(use_direct_agent=USE_DIRECT_AGENT)
 
 # Run the server
 if __name__ == "__main__":
     logger.info("Starting server on http://0.0.0.0:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # 默认的 "auto" 在已安装时会自动选用 uvloop 与 httptools（Windows 上没有 uvloop）。
+    # 限制单帧大小，避免超大消息耗尽内存
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+        ws_max_size=WS_MAX_SIZE,
+    )
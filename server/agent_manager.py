@@ -1,27 +1,176 @@
 import os
 import logging
 import asyncio
-from typing import Awaitable, Callable, Optional, Tuple
-from autogen_core import CancellationToken
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
-from autogen_agentchat.teams import MagenticOneGroupChat
-from tools.ticktick import TaskManager
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Tuple
+from server.http_client import get_http_client
+
+if TYPE_CHECKING:
+    # autogen 导入较重，仅用于类型注解；运行时在创建模型客户端和代理时才导入
+    from autogen_core import CancellationToken
+    from autogen_core.tools import FunctionTool
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
+    from tools.ticktick import TaskManager
 
 logger = logging.getLogger(__name__)
 
+# 历史摘要的固定标题。动态内容只追加在末尾，保证提示前缀稳定，便于模型服务端的前缀缓存命中
+_BACKGROUND_HEADER = "## Background Information\nUser's previous requests have been summarized as follows:\n"
+_REQUEST_HEADER = "\n\n## Request\n"
+
+# 默认模型与 OpenRouter 地址
+DEFAULT_MODEL = "anthropic/claude-3.7-sonnet"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# OpenRouter 上需要显式标记 cache_control 才会缓存提示前缀的模型
+_EXPLICIT_CACHE_MODEL_PREFIXES = ("anthropic/",)
+
+# 按 (model, base_url, api_key) 缓存的模型客户端，见 get_model_client()
+_MODEL_CLIENT_CACHE: dict[tuple[str, str, Optional[str]], "OpenAIChatCompletionClient"] = {}
+
+def get_model_client(
+    api_key: Optional[str], model: str = DEFAULT_MODEL, base_url: str = OPENROUTER_BASE_URL
+) -> "OpenAIChatCompletionClient":
+    """获取共享的模型客户端，首次调用时创建
+
+    模型客户端本身不保存对话状态，所有会话和两种代理模式复用同一实例，
+    避免重复初始化，并通过共享的 HTTP 客户端保持 keep-alive 连接。
+    """
+    key = (model, base_url, api_key)
+    if key not in _MODEL_CLIENT_CACHE:
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+        from server.prompt_cache_client import PromptCachingChatCompletionClient
+        client_class = (
+            PromptCachingChatCompletionClient
+            if model.startswith(_EXPLICIT_CACHE_MODEL_PREFIXES)
+            else OpenAIChatCompletionClient
+        )
+        _MODEL_CLIENT_CACHE[key] = client_class(
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            model_info={
+                "vision": False,
+                "function_calling": True,
+                "json_output": True,
+                "family": "unknown",
+            },
+            http_client=get_http_client()
+        )
+    return _MODEL_CLIENT_CACHE[key]
+
+# 助手能力说明，同时用作 description
+TOOL_CAPABILITIES = """\
+You are an expert task management assistant for TickTick's Inbox. You help users manage their tasks efficiently using the following capabilities:
+
+Available Functions:
+
+1. create_task(title, content='', due_date=None, start_date=None, is_all_day=True, priority=0)
+   - Creates a new task in Inbox with the following parameters:
+     * title: Task title (required)
+     * content: Task description
+     * due_date: Due date in 'YYYY-MM-DD' format
+     * start_date: Start date in 'YYYY-MM-DD' format
+     * is_all_day: Whether it's an all-day task
+     * priority: Task priority (0=none, 1=low, 3=medium, 5=high)
+
+2. list_tasks()
+
+3. complete_task(task_id)
+   - Marks a task as completed
+   - Requires task_id from list_tasks
+
+4. delete_task(task_id)
+   - Removes a task from Inbox
+   - Requires task_id from list_tasks
+
+5. get_tasks_by_date(start_date, end_date=None)
+   - Gets tasks within a date range:
+     * start_date: Start date 'YYYY-MM-DD'
+     * end_date: Optional end date 'YYYY-MM-DD'
+
+6. get_completed_tasks()
+   - Retrieves all completed tasks from Inbox
+"""
+
+# 按 TaskManager 缓存的工具列表，见 get_task_tools()
+_TASK_TOOLS_CACHE: dict[int, list["FunctionTool"]] = {}
+
+def get_task_tools(task_manager: "TaskManager") -> list["FunctionTool"]:
+    """获取 TaskManager 对应的工具列表，首次调用时创建
+
+    FunctionTool 在构造时会解析函数签名和类型注解生成 JSON schema。TaskManager 按凭据共享，
+    因此为每个实例只生成一次工具，之后所有助手直接复用，不再重复解析。
+    """
+    key = id(task_manager)
+    if key not in _TASK_TOOLS_CACHE:
+        from autogen_core.tools import FunctionTool
+        _TASK_TOOLS_CACHE[key] = [
+            FunctionTool(func, description=func.__doc__ or "")
+            for func in (
+                task_manager.create_task,
+                task_manager.list_tasks,
+                task_manager.complete_task,
+                task_manager.delete_task,
+                task_manager.get_tasks_by_date,
+                task_manager.get_completed_tasks,
+            )
+        ]
+    return _TASK_TOOLS_CACHE[key]
+
+# 两种代理模式共用的静态指令。放在系统提示的最前面且保持逐字节不变，
+# 使每轮请求共享同一前缀；Anthropic 模型的缓存断点见 server.prompt_cache_client
+STATIC_INSTRUCTIONS = TOOL_CAPABILITIES + """
+Always follow these steps:
+1. UNDERSTAND: Analyze the user's request carefully
+2. VALIDATE: Ensure you have all required information
+3. EXECUTE: Perform the requested operation
+4. VERIFY: Check the result and provide clear feedback
+
+Important Notes:
+- All dates must be in 'YYYY-MM-DD' format
+- Priority levels: 0=none, 1=low, 3=medium, 5=high
+- All operations are performed in the Inbox
+- Task IDs are required for complete_task and delete_task
+"""
+
+# 团队模式的系统提示
+_SYSTEM_MESSAGE = STATIC_INSTRUCTIONS + "\nSay 'goodbye' to end the conversation.\n"
+
+def build_task_prompt(user_request: str, history_digest: str) -> str:
+    """根据用户请求和历史摘要生成任务提示
+
+    摘要在前、用户请求在后：同一会话内摘要不变，因此连续请求共享同一前缀。
+    """
+    if not history_digest:
+        return user_request
+    return _BACKGROUND_HEADER + history_digest + _REQUEST_HEADER + user_request
+
+# 用户输入队列的容量上限
+USER_INPUT_QUEUE_SIZE = 16
+
+async def put_with_yield(queue: asyncio.Queue, item) -> None:
+    """放入有界队列：未满时立即放入并主动让出一次事件循环，队列满时等待消费者取走"""
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        await queue.put(item)
+    else:
+        # put_nowait 不会切换任务，显式让出，避免连续输入独占事件循环
+        await asyncio.sleep(0)
+
 class UserInputHelper:
     def __init__(self):
-        self.user_input_queue = asyncio.Queue()
+        self.user_input_queue = asyncio.Queue(maxsize=USER_INPUT_QUEUE_SIZE)
 
-    def get_user_input_func(self) -> Callable[[str, Optional[CancellationToken]], Awaitable[str]]:
-        async def user_input(prompt: str, cancellation_token: Optional[CancellationToken]) -> str:
+    def get_user_input_func(self) -> Callable[[str, Optional["CancellationToken"]], Awaitable[str]]:
+        async def user_input(prompt: str, cancellation_token: Optional["CancellationToken"]) -> str:
             return await self.user_input_queue.get()
 
         return user_input
 
     async def recv_user_input(self, text: str):
-        await self.user_input_queue.put(text)
+        await put_with_yield(self.user_input_queue, text)
 
 class AgentManager:
     def __init__(self):
@@ -37,117 +186,26 @@ class AgentManager:
         if not isinstance(self.ticktick_client_id, str) or not isinstance(self.ticktick_client_secret, str):
             raise TypeError("TickTick client_id and client_secret must be strings")
     
-    def init_agents(self) -> Tuple[AssistantAgent, UserProxyAgent, OpenAIChatCompletionClient, UserInputHelper]:
+    def init_agents(
+        self,
+    ) -> Tuple["AssistantAgent", "UserProxyAgent", "OpenAIChatCompletionClient", "UserInputHelper"]:
         """初始化代理和模型客户端"""
-        # 初始化任务管理器
-        task_manager = TaskManager(self.ticktick_client_id, self.ticktick_client_secret)
-
-        # 创建模型客户端
-        model_client = OpenAIChatCompletionClient(
-            model="anthropic/claude-3.7-sonnet",
-            api_key=self.openroute_api_key,
-            base_url="https://openrouter.ai/api/v1",
-            model_info={
-                "vision": False,
-                "function_calling": True,
-                "json_output": True,
-                "family": "unknown",
-            },
-            llm_config={
-                "cache_seed": 42,  # 启用缓存，种子为42
-                "cache_path_root": ".cache/llm_cache"  # 指定缓存目录
-            }
-        )
+        from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
+        from tools.ticktick import get_task_manager
+
+        # 获取共享的任务管理器
+        task_manager = get_task_manager(self.ticktick_client_id, self.ticktick_client_secret)
+
+        # 获取共享的模型客户端
+        model_client = get_model_client(self.openroute_api_key)
 
         # 创建任务管理助手
         assistant = AssistantAgent(
             name="task_assistant",
-            system_message="""
-            You are an expert task management assistant for TickTick's Inbox. You help users manage their tasks efficiently using the following capabilities:
-
-            Available Functions:
-
-            1. create_task(title, content='', due_date=None, start_date=None, is_all_day=True, priority=0)
-               - Creates a new task in Inbox with the following parameters:
-                 * title: Task title (required)
-                 * content: Task description
-                 * due_date: Due date in 'YYYY-MM-DD' format
-                 * start_date: Start date in 'YYYY-MM-DD' format
-                 * is_all_day: Whether it's an all-day task
-                 * priority: Task priority (0=none, 1=low, 3=medium, 5=high)
-
-            2. list_tasks()
-
-            3. complete_task(task_id)
-               - Marks a task as completed
-               - Requires task_id from list_tasks
-
-            4. delete_task(task_id)
-               - Removes a task from Inbox
-               - Requires task_id from list_tasks
-
-            5. get_tasks_by_date(start_date, end_date=None)
-               - Gets tasks within a date range:
-                 * start_date: Start date 'YYYY-MM-DD'
-                 * end_date: Optional end date 'YYYY-MM-DD'
-
-            6. get_completed_tasks()
-               - Retrieves all completed tasks from Inbox
-
-            Always follow these steps:
-            1. UNDERSTAND: Analyze the user's request carefully
-            2. VALIDATE: Ensure you have all required information
-            3. EXECUTE: Perform the requested operation
-            4. VERIFY: Check the result and provide clear feedback
-
-            Important Notes:
-            - All dates must be in 'YYYY-MM-DD' format
-            - Priority levels: 0=none, 1=low, 3=medium, 5=high
-            - All operations are performed in the Inbox
-            - Task IDs are required for complete_task and delete_task
-
-            Say 'goodbye' to end the conversation.
-            """,
-            tools=[
-                task_manager.create_task,
-                task_manager.list_tasks,
-                task_manager.complete_task,
-                task_manager.delete_task,
-                task_manager.get_tasks_by_date,
-                task_manager.get_completed_tasks
-            ],
+            system_message=_SYSTEM_MESSAGE,
+            tools=get_task_tools(task_manager),
             model_client=model_client,
-            description='''An expert task management assistant for TickTick's Inbox. You help users manage their tasks efficiently using the following capabilities:
-
-            Available Functions:
-
-            1. create_task(title, content='', due_date=None, start_date=None, is_all_day=True, priority=0)
-               - Creates a new task in Inbox with the following parameters:
-                 * title: Task title (required)
-                 * content: Task description
-                 * due_date: Due date in 'YYYY-MM-DD' format
-                 * start_date: Start date in 'YYYY-MM-DD' format
-                 * is_all_day: Whether it's an all-day task
-                 * priority: Task priority (0=none, 1=low, 3=medium, 5=high)
-
-            2. list_tasks()
-
-            3. complete_task(task_id)
-               - Marks a task as completed
-               - Requires task_id from list_tasks
-
-            4. delete_task(task_id)
-               - Removes a task from Inbox
-               - Requires task_id from list_tasks
-
-            5. get_tasks_by_date(start_date, end_date=None)
-               - Gets tasks within a date range:
-                 * start_date: Start date 'YYYY-MM-DD'
-                 * end_date: Optional end date 'YYYY-MM-DD'
-
-            6. get_completed_tasks()
-               - Retrieves all completed tasks from Inbox
-            '''
+            description=TOOL_CAPABILITIES
         )
 
         user_input_helper = UserInputHelper()
@@ -162,6 +220,7 @@ class AgentManager:
     
     def create_team(self, assistant, user_proxy, model_client):
         """创建团队"""
+        from autogen_agentchat.teams import MagenticOneGroupChat
         return MagenticOneGroupChat(
             participants=[user_proxy, assistant],
             model_client=model_client,
@@ -172,12 +231,4 @@ class AgentManager:
     
     def task_prompt(self, user_request: str, history_digest: str) -> str:
         """根据用户请求生成任务提示"""
-        task_description = """{user_request}"""
-
-        if history_digest:
-            task_description += """
-    ## Background Information
-    User's previous requests have been summarized as follows:
-    {history_digest}
-    """
-        return task_description.format(user_request=user_request, history_digest=history_digest) 
\ No newline at end of file
+        return build_task_prompt(user_request, history_digest)
@@ -1,23 +1,36 @@
 import os
 import logging
 import asyncio
+from collections import deque
 from typing import Awaitable, Callable, Optional, Tuple
-from autogen_core import CancellationToken
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from tools.ticktick import TaskManager
+from server.agent_manager import (
+    STATIC_INSTRUCTIONS,
+    USER_INPUT_QUEUE_SIZE,
+    build_task_prompt,
+    get_model_client,
+    get_task_tools,
+    put_with_yield,
+)
 
 logger = logging.getLogger(__name__)
 
+# 对话历史保留的最大条数
+HISTORY_WINDOW = 200
+
+# 直接模式的系统提示
+_SYSTEM_MESSAGE = (
+    STATIC_INSTRUCTIONS
+    + "\nAt the end of your response, always provide a brief summary of what was accomplished or what the next steps should be.\n"
+)
+
 class UserInputHelper:
     def __init__(self):
-        self.user_input_queue = asyncio.Queue()
-        self.response_queue = asyncio.Queue()
+        self.user_input_queue = asyncio.Queue(maxsize=USER_INPUT_QUEUE_SIZE)
+        self.response_queue = asyncio.Queue(maxsize=USER_INPUT_QUEUE_SIZE)
 
     async def send_user_input(self, text: str):
         """发送用户输入到队列"""
-        await self.user_input_queue.put(text)
+        await put_with_yield(self.user_input_queue, text)
     
     async def get_response(self):
         """获取助手的响应"""
@@ -25,7 +38,7 @@ class UserInputHelper:
     
     async def send_response(self, text: str):
         """发送助手的响应到队列"""
-        await self.response_queue.put(text)
+        await put_with_yield(self.response_queue, text)
 
 class AgentManager:
     def __init__(self):
@@ -44,87 +57,27 @@ class AgentManager:
         self.user_input_helper = UserInputHelper()
         self.assistant = None
         self.model_client = None
-        self.history = []
+        # 只保留最近 HISTORY_WINDOW 条记录，限制内存占用和摘要提示的长度
+        self.history = deque(maxlen=HISTORY_WINDOW)
+        self.summarizer = None
     
     def init_agent(self):
         """初始化助手代理"""
-        # 初始化任务管理器
-        task_manager = TaskManager(self.ticktick_client_id, self.ticktick_client_secret)
+        # autogen 导入较重，创建助手时才导入
+        from autogen_agentchat.agents import AssistantAgent
+        from tools.ticktick import get_task_manager
 
-        # 创建模型客户端
-        self.model_client = OpenAIChatCompletionClient(
-            model="anthropic/claude-3.7-sonnet",
-            api_key=self.openroute_api_key,
-            base_url="https://openrouter.ai/api/v1",
-            model_info={
-                "vision": False,
-                "function_calling": True,
-                "json_output": True,
-                "family": "unknown",
-            },
-            llm_config={
-                "cache_seed": 42,  # 启用缓存，种子为42
-                "cache_path_root": ".cache/llm_cache"  # 指定缓存目录
-            }
-        )
+        # 获取共享的任务管理器
+        task_manager = get_task_manager(self.ticktick_client_id, self.ticktick_client_secret)
+
+        # 获取共享的模型客户端
+        self.model_client = get_model_client(self.openroute_api_key)
 
         # 创建任务管理助手
         self.assistant = AssistantAgent(
             name="task_assistant",
-            system_message="""
-            You are an expert task management assistant for TickTick's Inbox. You help users manage their tasks efficiently using the following capabilities:
-
-            Available Functions:
-
-            1. create_task(title, content='', due_date=None, start_date=None, is_all_day=True, priority=0)
-               - Creates a new task in Inbox with the following parameters:
-                 * title: Task title (required)
-                 * content: Task description
-                 * due_date: Due date in 'YYYY-MM-DD' format
-                 * start_date: Start date in 'YYYY-MM-DD' format
-                 * is_all_day: Whether it's an all-day task
-                 * priority: Task priority (0=none, 1=low, 3=medium, 5=high)
-
-            2. list_tasks()
-
-            3. complete_task(task_id)
-               - Marks a task as completed
-               - Requires task_id from list_tasks
-
-            4. delete_task(task_id)
-               - Removes a task from Inbox
-               - Requires task_id from list_tasks
-
-            5. get_tasks_by_date(start_date, end_date=None)
-               - Gets tasks within a date range:
-                 * start_date: Start date 'YYYY-MM-DD'
-                 * end_date: Optional end date 'YYYY-MM-DD'
-
-            6. get_completed_tasks()
-               - Retrieves all completed tasks from Inbox
-
-            Always follow these steps:
-            1. UNDERSTAND: Analyze the user's request carefully
-            2. VALIDATE: Ensure you have all required information
-            3. EXECUTE: Perform the requested operation
-            4. VERIFY: Check the result and provide clear feedback
-
-            Important Notes:
-            - All dates must be in 'YYYY-MM-DD' format
-            - Priority levels: 0=none, 1=low, 3=medium, 5=high
-            - All operations are performed in the Inbox
-            - Task IDs are required for complete_task and delete_task
-
-            At the end of your response, always provide a brief summary of what was accomplished or what the next steps should be.
-            """,
-            tools=[
-                task_manager.create_task,
-                task_manager.list_tasks,
-                task_manager.complete_task,
-                task_manager.delete_task,
-                task_manager.get_tasks_by_date,
-                task_manager.get_completed_tasks
-            ],
+            system_message=_SYSTEM_MESSAGE,
+            tools=get_task_tools(task_manager),
             model_client=self.model_client
         )
         
@@ -141,13 +94,13 @@ class AgentManager:
         Returns:
             str: 助手的响应
         """
+        from autogen_core import CancellationToken
+        from autogen_agentchat.messages import TextMessage
         if not self.assistant:
             self.init_agent()
         
         # 准备消息，包含历史摘要（如果有）
-        prompt = user_message
-        if history_digest:
-            prompt = f"{user_message}\n\n## Background Information\nPrevious conversations summary: {history_digest}"
+        prompt = build_task_prompt(user_message, history_digest)
         
         # 记录用户消息
         self.history.append(("user", prompt))
@@ -176,38 +129,13 @@ class AgentManager:
         if not self.history:
             return "没有可用的对话历史。"
         
-        # 创建摘要专用的agent
-        summarizer = AssistantAgent(
-            name="Summarizer",
-            system_message="你是一个专门负责总结对话的助手。你的任务是提取对话中的关键信息，并以列表形式返回重要的要点。",
-            model_client=self.model_client
-        )
-        
         # 将历史记录格式化为带编号的文本
-        history_text = "\n".join([f"{i+1}. [{msg[0]}] {msg[1]}" for i, msg in enumerate(self.history)])
-        summary_prompt = (
-            "请将以下对话历史总结为简明的关键点列表，"
-            "重点保留用户的意图和重要信息：\n\n"
-            f"{history_text}\n\n"
-        )
-        
-        # 使用总结agent生成摘要
-        response = await summarizer.on_messages(
-            [TextMessage(content=summary_prompt, source="user")],
-            CancellationToken()
-        )
-        
-        # 返回摘要文本
-        return response.chat_message.content
+        history_text = "\n".join(f"{i}. [{role}] {text}" for i, (role, text) in enumerate(self.history, 1))
+        if self.summarizer is None:
+            from session import Summarizer
+            self.summarizer = Summarizer(self.model_client)
+        return await self.summarizer.summarize(history_text)
     
     def task_prompt(self, user_request: str, history_digest: str) -> str:
         """根据用户请求生成任务提示"""
-        task_description = """{user_request}"""
-
-        if history_digest:
-            task_description += """
-## Background Information
-User's previous requests have been summarized as follows:
-{history_digest}
-"""
-        return task_description.format(user_request=user_request, history_digest=history_digest) 
\ No newline at end of file
+        return build_task_prompt(user_request, history_digest)
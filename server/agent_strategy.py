@@ -1,12 +1,16 @@
+import re
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
-from session import Session, SessionResult
-from server.agent_manager import AgentManager as TeamAgentManager
-from server.agent_manager1 import AgentManager as DirectAgentManager
+from typing import Awaitable, Callable, Tuple, Optional
+
+# 各策略依赖的 autogen 模块较重，只在实际创建对应策略时才导入
 
 logger = logging.getLogger(__name__)
 
+# 助手回复中表示对话结束的告别语，单次扫描且无需先把整段回复转为小写
+_FAREWELL_RE = re.compile(r"goodbye|再见", re.IGNORECASE)
+
 class AgentStrategy(ABC):
     """代理策略接口，定义了代理交互的通用方法"""
     
@@ -16,18 +20,31 @@ class AgentStrategy(ABC):
         pass
     
     @abstractmethod
-    async def process_message(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+    async def process_message(
+        self, text: str, on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
         """
         处理用户消息
         
         Args:
             text (str): 用户消息
+            on_partial (Callable, optional): 中间消息回调，用于在推理过程中逐条推送输出
             
         Returns:
             Tuple[Optional[str], Optional[str]]: (状态, 消息内容)
         """
         pass
     
+    @abstractmethod
+    async def recycle(self) -> bool:
+        """
+        清除会话状态，使策略可以交给新的连接复用
+        
+        Returns:
+            bool: 是否已清除完毕、可以复用；无法安全重置时返回 False
+        """
+        pass
+    
     @property
     @abstractmethod
     def history_digest(self) -> str:
@@ -39,21 +56,56 @@ class TeamAgentStrategy(AgentStrategy):
     """团队代理策略，使用MagenticOneGroupChat实现"""
     
     def __init__(self):
+        from server.agent_manager import AgentManager as TeamAgentManager
         self.agent_manager = TeamAgentManager()
+        self.team = None
+        self.model_client = None
         self.session = None
+        self.summarizer = None
         self.user_input_helper = None
         self._history_digest = ""
     
     async def initialize(self) -> None:
-        """初始化团队代理"""
+        """初始化团队代理，已初始化（如从池中取出）时直接返回"""
+        if self.session is not None:
+            return
+        from session import Session, Summarizer
         assistant, user_proxy, model_client, user_input_helper = self.agent_manager.init_agents()
-        team = self.agent_manager.create_team(assistant, user_proxy, model_client)
-        self.session = Session(team, model_client)
+        self.team = self.agent_manager.create_team(assistant, user_proxy, model_client)
+        self.model_client = model_client
+        # 摘要生成器在策略的整个生命周期内复用，不随每次重置的会话重新创建
+        self.summarizer = Summarizer(model_client)
+        self.session = Session(self.team, model_client, self.summarizer)
         self.user_input_helper = user_input_helper
         logger.info("Session initialized with team interaction")
+
+    async def reset(self) -> None:
+        """重置团队状态并开启新会话，复用已创建的代理而不是重新构建"""
+        from session import Session
+        # reset() 会清空团队及各参与者（包括助手的 model_context）的状态
+        await self.team.reset()
+        self.session = Session(self.team, self.model_client, self.summarizer)
+        logger.info("Session reset with team interaction")
+
+    async def recycle(self) -> bool:
+        """清除团队、会话和摘要状态；会话进行中时团队无法重置，不予复用"""
+        if self.session is None:
+            return True
+        if self.session.is_active:
+            return False
+        await self.reset()
+        # 丢弃上一个连接未被消费的输入
+        while not self.user_input_helper.user_input_queue.empty():
+            self.user_input_helper.user_input_queue.get_nowait()
+        self._history_digest = ""
+        return True
     
-    async def process_message(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+    async def process_message(
+        self, text: str, on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
         """处理用户消息，使用团队交互模式"""
+        from session import SessionResult
+        
         # 确保会话已初始化
         if not self.session:
             await self.initialize()
@@ -64,23 +116,40 @@ class TeamAgentStrategy(AgentStrategy):
         else:
             await self.user_input_helper.recv_user_input(text)
         
-        # 继续推理
-        result: SessionResult = await self.session.run_until_stop()
+        # 最近一条尚未推送的中间消息。推迟一条再推送，停下时它若就是最终回复，
+        # 则只通过 [status] 帧发送一次，不会重复
+        pending: Optional[str] = None
+        
+        async def forward(content: str, source: str):
+            nonlocal pending
+            # 用户自己的输入无需回显
+            if source == "user":
+                return
+            if pending is not None:
+                await on_partial(pending)
+            pending = content
+        
+        # 继续推理，中间消息通过 on_partial 实时推送
+        result: SessionResult = await self.session.run_until_stop(
+            on_message=forward if on_partial else None
+        )
+        # 会话结束时最终帧发送的是摘要，最后一条回复仍需作为中间消息推送
+        if pending is not None and (
+            result.status == SessionResult.FINISHED or pending != result.last_message
+        ):
+            await on_partial(pending)
         
         # 处理结果
-        if result == SessionResult.FINISHED:
-            # 会话结束，生成摘要
-            self._history_digest = await self.session.digest()
-            logger.info(f"History digest: {self._history_digest}")
-            
-            # 创建新会话
-            await self.initialize()
+        if result.status == SessionResult.FINISHED:
+            # 会话结束：生成摘要与重置团队互不依赖，并发执行
+            self._history_digest, _ = await asyncio.gather(self.session.digest(), self.reset())
+            logger.info("History digest (%d chars): %.120s", len(self._history_digest), self._history_digest)
             
             return result.status, self._history_digest
         
         # 返回最后的消息
         if result.last_message:
-            logger.info(f"Sent result: [{result.status}] {result.last_message}")
+            logger.info("Sent result: [%s] %.120s", result.status, result.last_message)
             return result.status, result.last_message
         
         return None, None
@@ -95,35 +164,66 @@ class DirectAgentStrategy(AgentStrategy):
     """直接代理策略，直接与助手交互"""
     
     def __init__(self):
+        from server.agent_manager1 import AgentManager as DirectAgentManager
         self.agent_manager = DirectAgentManager()
         self._history_digest = ""
+        # 后台生成中的摘要，在下一条消息使用前等待
+        self._digest_task: Optional[asyncio.Task] = None
     
     async def initialize(self) -> None:
-        """初始化直接代理"""
+        """初始化直接代理，已初始化（如从池中取出）时直接返回"""
+        if self.agent_manager.assistant:
+            return
         self.agent_manager.init_agent()
         logger.info("Session initialized with direct agent interaction")
     
-    async def process_message(self, text: str) -> Tuple[Optional[str], Optional[str]]:
-        """处理用户消息，使用直接交互模式"""
+    async def process_message(
+        self, text: str, on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """处理用户消息，使用直接交互模式（只有一条最终回复，不产生中间消息）"""
         # 确保代理已初始化
         if not self.agent_manager.assistant:
             await self.initialize()
         
+        # 上一轮会话的摘要在后台生成，构建提示前等待其完成。先取下任务再等待，
+        # 生成失败时只记录日志并沿用之前的摘要，不影响本条及之后的消息
+        if self._digest_task:
+            task, self._digest_task = self._digest_task, None
+            try:
+                self._history_digest = await task
+            except Exception:
+                logger.warning("Failed to generate history digest, keeping the previous one", exc_info=True)
+            else:
+                logger.info(
+                    "Generated history digest (%d chars): %.120s", len(self._history_digest), self._history_digest
+                )
+        
         # 直接处理消息并获取响应
         response = await self.agent_manager.process_message(text, self._history_digest)
         
         # 检查是否需要生成新的摘要
-        if "goodbye" in response.lower() or "再见" in response:
-            # 生成对话历史摘要
-            self._history_digest = await self.agent_manager.generate_digest()
-            logger.info(f"Generated history digest: {self._history_digest}")
+        if _FAREWELL_RE.search(response):
+            # 在后台生成对话历史摘要，先把响应返回给用户
+            self._digest_task = asyncio.create_task(self.agent_manager.generate_digest())
             
             # 返回结束状态和响应
             return "finished", response
         
         # 返回正常状态和响应
-        logger.info(f"Sent response: {response[:100]}...")
+        logger.info("Sent response: %.120s", response)
         return "user_input_requested", response
+
+    async def recycle(self) -> bool:
+        """清除助手上下文、对话历史和摘要状态"""
+        from autogen_core import CancellationToken
+        if self._digest_task:
+            self._digest_task.cancel()
+            self._digest_task = None
+        if self.agent_manager.assistant:
+            await self.agent_manager.assistant.on_reset(CancellationToken())
+        self.agent_manager.history.clear()
+        self._history_digest = ""
+        return True
     
     @property
     def history_digest(self) -> str:
@@ -144,4 +244,28 @@ def create_agent_strategy(use_direct_agent: bool = False) -> AgentStrategy:
     if use_direct_agent:
         return DirectAgentStrategy()
     else:
-        return TeamAgentStrategy() 
\ No newline at end of file
+        return TeamAgentStrategy()
+
+
+# 空闲策略池，按代理模式区分；连接断开后策略被重置并放回，供新连接复用已构建的代理
+_STRATEGY_POOL: dict[bool, list[AgentStrategy]] = {True: [], False: []}
+# 每种模式最多保留的空闲策略数
+MAX_POOLED_STRATEGIES = 8
+
+def acquire_agent_strategy(use_direct_agent: bool = False) -> AgentStrategy:
+    """从池中取出空闲的代理策略，池为空时新建"""
+    pool = _STRATEGY_POOL[use_direct_agent]
+    if pool:
+        return pool.pop()
+    return create_agent_strategy(use_direct_agent)
+
+async def release_agent_strategy(strategy: AgentStrategy, use_direct_agent: bool = False) -> None:
+    """重置代理策略并放回池中；池已满或无法安全重置时直接丢弃"""
+    pool = _STRATEGY_POOL[use_direct_agent]
+    if len(pool) >= MAX_POOLED_STRATEGIES:
+        return
+    try:
+        if await strategy.recycle():
+            pool.append(strategy)
+    except Exception:
+        logger.warning("Failed to recycle agent strategy, discarding it", exc_info=True) 
\ No newline at end of file
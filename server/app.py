@@ -0,0 +1,170 @@
+import json
+import asyncio
+import logging
+from typing import Optional, Tuple
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse
+from fastapi.middleware.cors import CORSMiddleware
+from server.session_handler import SessionHandler
+from server.http_client import close_http_client
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库 json
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 连接空闲超过该时长（秒）未收到消息时主动关闭，释放其占用的代理和会话状态
+IDLE_TIMEOUT = 3600
+
+# 每个连接同时处理的消息数上限（转录可并发，推理仍按顺序进行）
+MAX_CONCURRENT_MESSAGES = 4
+
+def _dumps(payload) -> str:
+    """序列化合并帧，优先使用 orjson
+
+    客户端按文本帧读取（浏览器中二进制帧是 Blob），因此仍返回 str。
+    """
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, ensure_ascii=False)
+
+# 合并帧中消息内容累计长度的上限，放不下的消息留到下一帧发送
+MAX_BATCH_SIZE = 64 * 1024
+
+def _pack(batch: list[str]) -> str:
+    """只有一条消息时原样发送；多条时打包为 {"type": "multi", "payload": [...]}，由客户端拆分"""
+    if len(batch) == 1:
+        return batch[0]
+    return _dumps({"type": "multi", "payload": batch})
+
+def drain_batch(outbox: asyncio.Queue, first: str) -> Tuple[str, Optional[str]]:
+    """把 outbox 中已就绪的消息与 first 合并为一帧
+
+    合并后的消息内容累计长度不超过 MAX_BATCH_SIZE；first 本身超过上限时单独成帧。
+
+    Returns:
+        Tuple[str, Optional[str]]: (要发送的帧, 放不下而取出的下一条消息)，
+            后者不为 None 时应作为下一帧的 first
+    """
+    batch = [first]
+    size = len(first)
+    while not outbox.empty():
+        message = outbox.get_nowait()
+        if size + len(message) > MAX_BATCH_SIZE:
+            return _pack(batch), message
+        batch.append(message)
+        size += len(message)
+    return _pack(batch), None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 关闭所有 OpenAI 请求共享的 HTTP 连接池
+    await close_http_client()
+
+def create_app(use_direct_agent: bool = False) -> FastAPI:
+    """
+    创建 FastAPI 应用，注册中间件、静态文件、WebSocket 与根路由
+    
+    Args:
+        use_direct_agent (bool): 是否使用直接代理交互模式，默认为False（使用团队模式）
+        
+    Returns:
+        FastAPI: 配置好的应用实例
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    # Add CORS support
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Mount static files（check_dir=False：启动时不检查目录，省去一次 stat）
+    app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
+
+    # WebSocket endpoint
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        await websocket.accept()
+
+        client_id = id(websocket)
+        logger.info("New WebSocket connection: %s", client_id)
+        
+        # 为每个连接创建一个新的SessionHandler实例，并设置代理模式
+        session_handler = SessionHandler(use_direct_agent=use_direct_agent)
+        await session_handler.initialize()
+
+        # 读取、处理、发送分别由独立任务完成，之间用有界队列连接：
+        # 队列满时上游的 put 会阻塞，从而对客户端施加背压
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=8)
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=32)
+        message_slots = asyncio.Semaphore(MAX_CONCURRENT_MESSAGES)
+
+        async def reader():
+            while True:
+                try:
+                    async with asyncio.timeout(IDLE_TIMEOUT):
+                        data = await websocket.receive_text()
+                except TimeoutError:
+                    logger.info("Closing idle WebSocket connection: %s", client_id)
+                    await websocket.close(code=1001)
+                    raise WebSocketDisconnect(code=1001)
+                await inbox.put(data)
+
+        async def send_partial(content: str):
+            await outbox.put(f"[partial] {content}")
+
+        async def handle(data: str):
+            try:
+                status, message = await session_handler.handle_message(data, on_partial=send_partial)
+                if status and message:
+                    await outbox.put(f"[{status}] {message}")
+            finally:
+                message_slots.release()
+
+        async def worker():
+            # 最多 MAX_CONCURRENT_MESSAGES 条消息同时处理：后续音频的转录与当前推理重叠，
+            # SessionHandler 保证交给代理和返回结果的顺序与到达顺序一致；
+            # 推理过程中的中间消息以 [partial] 帧实时推送，最终结果仍以 [status] 帧发送
+            async with asyncio.TaskGroup() as handlers:
+                while True:
+                    data = await inbox.get()
+                    await message_slots.acquire()
+                    handlers.create_task(handle(data))
+
+        async def writer():
+            # 流式输出时一次性发送所有已就绪的消息，减少 WebSocket 帧数和系统调用
+            carry = None
+            while True:
+                first = carry if carry is not None else await outbox.get()
+                frame, carry = drain_batch(outbox, first)
+                await websocket.send_text(frame)
+
+        try:
+            # 任一任务退出（如客户端断开）时，TaskGroup 会取消其余任务
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(reader())
+                tg.create_task(worker())
+                tg.create_task(writer())
+        except* WebSocketDisconnect:
+            pass
+        except* Exception as eg:
+            logger.error("WebSocket error for client %s: %s", client_id, eg.exceptions, exc_info=eg)
+        finally:
+            await session_handler.close()
+            logger.info("WebSocket connection closed: %s", client_id)
+
+    # Root route
+    @app.get("/")
+    async def root():
+        return FileResponse("static/asr.html")
+
+    return app
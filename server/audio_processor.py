@@ -1,19 +1,47 @@
-import os
-import base64
+import io
+import asyncio
 import logging
-from datetime import datetime
+from typing import Optional
 import openai
+from server.http_client import get_http_client
+
+try:
+    import pybase64 as base64  # SIMD 加速的 base64 解码
+except ImportError:
+    import base64
 
 logger = logging.getLogger(__name__)
 
+# base64 音频数据的长度上限（字符），超出时在解码前直接拒绝
+MAX_AUDIO_B64_SIZE = 2_000_000
+
+# 超过该长度（字符）的 base64 数据在线程中解码，避免阻塞事件循环；小数据直接解码更快
+THREAD_DECODE_THRESHOLD = 256_000
+
+# 所有连接共享的 Whisper 并发上限
+MAX_CONCURRENT_TRANSCRIPTIONS = 32
+_transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+_shared_client: Optional[openai.AsyncOpenAI] = None
+
+def get_transcription_client() -> openai.AsyncOpenAI:
+    """获取进程内共享的 AsyncOpenAI 客户端（首次调用时创建）
+
+    所有连接的转录请求复用共享 HTTP 客户端的连接池，而不是每个连接各自建立 TLS 连接。
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = openai.AsyncOpenAI(http_client=get_http_client())
+    return _shared_client
+
 class AudioProcessor:
-    def __init__(self, audio_dir="audio_files"):
-        self.audio_dir = audio_dir
-        if not os.path.exists(self.audio_dir):
-            os.makedirs(self.audio_dir)
-            logger.info(f"Created audio directory: {self.audio_dir}")
+    def __init__(self, client: Optional[openai.AsyncOpenAI] = None):
+        """
+        Args:
+            client (openai.AsyncOpenAI, optional): 用于转录的异步 OpenAI 客户端，默认使用共享客户端
+        """
+        self.client = client or get_transcription_client()
     
-    def process_audio(self, audio_data):
+    async def process_audio(self, audio_data):
         """
         处理音频数据并转换为文本
         
@@ -22,41 +50,42 @@ class AudioProcessor:
             
         Returns:
             str: 转录的文本
-        """
-        try:
-            # 解析MIME类型和Base64数据
-            mime_type = audio_data.split(',')[0].split(':')[1].split(';')[0]
-            logger.info(f"Received audio MIME type: {mime_type}")
             
-            audio_bytes = base64.b64decode(audio_data.split(',')[1])
-            logger.info(f"Decoded base64 data size: {len(audio_bytes)} bytes")
-            
-            # 保存原始数据到临时文件
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            temp_audio = f"{self.audio_dir}/temp_{timestamp}.webm"
-            
-            with open(temp_audio, 'wb') as f:
-                f.write(audio_bytes)
-            
-            try:
-                # 使用OpenAI Whisper API进行转录
-                logger.info("Starting transcription with OpenAI Whisper API...")
-                with open(temp_audio, 'rb') as audio_file:
-                    response = openai.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file
-                    )
-                
-                text = response.text
-                logger.info(f"Final transcription: {text}")
-                
-                return text
-                
-            finally:
-                # 清理临时文件
-                if os.path.exists(temp_audio):
-                    os.remove(temp_audio)
-                    
-        except Exception as e:
-            logger.error(f"Error processing audio: {e}", exc_info=True)
-            raise 
\ No newline at end of file
+        Raises:
+            ValueError: 数据格式错误或超出大小限制；异常由调用方统一记录并返回给客户端
+        """
+        # 解析MIME类型和Base64数据：data:<mime>;base64,<payload>
+        header, _, payload = audio_data.partition(',')
+        mime_type = header[5:header.index(';')]
+        logger.debug("Received audio MIME type: %s", mime_type)
+        
+        # 在分配解码缓冲区之前检查大小，超大或空数据直接返回
+        if len(payload) > MAX_AUDIO_B64_SIZE:
+            raise ValueError(f"Audio payload too large: {len(payload)} > {MAX_AUDIO_B64_SIZE}")
+        if not payload:
+            logger.warning("Received empty audio data")
+            return ""
+        
+        if len(payload) > THREAD_DECODE_THRESHOLD:
+            audio_bytes = await asyncio.to_thread(base64.b64decode, payload)
+        else:
+            audio_bytes = base64.b64decode(payload)
+        logger.debug("Decoded base64 data size: %d bytes", len(audio_bytes))
+        
+        # 直接在内存中上传音频，并带上客户端声明的 MIME 类型，
+        # 不再依赖 OpenAI 客户端根据文件名推断
+        audio_file = ("audio.webm", io.BytesIO(audio_bytes), mime_type)
+        
+        # 使用OpenAI Whisper API进行转录
+        logger.debug("Starting transcription with OpenAI Whisper API...")
+        async with _transcription_semaphore:
+            response = await self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file
+            )
+        
+        text = response.text
+        # 只记录长度和前 120 个字符，避免整段转录文本进入日志
+        logger.info("Final transcription (%d chars): %.120s", len(text), text)
+        
+        return text
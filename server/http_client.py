@@ -0,0 +1,36 @@
+import logging
+from typing import Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """获取进程内共享的 httpx.AsyncClient（首次调用时创建）
+
+    所有 OpenAI 流量（Whisper 转录与聊天模型）都经由这个客户端发送，
+    以复用连接池；可用时启用 HTTP/2，让并发请求在同一条连接上多路复用。
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            timeout=60.0
+        )
+        logger.info("Created shared HTTP client (http2=%s)", HTTP2_AVAILABLE)
+    return _shared_client
+
+async def close_http_client() -> None:
+    """关闭共享的 HTTP 客户端，在服务关闭时调用"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
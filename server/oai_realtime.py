@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify, send_from_directory
 import openai
 import os
-import requests
+import atexit
+import httpx
 from dotenv import load_dotenv
 import logging
+from server.http_client import HTTP2_AVAILABLE
 
 # 配置日志
 logging.basicConfig(
@@ -22,6 +24,14 @@ if not api_key:
 
 client = openai.OpenAI(api_key=api_key)
 
+# 获取 ephemeral token 的请求复用同一个连接池，避免每次重新建立 TCP/TLS 连接
+_session = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_keepalive_connections=10, max_connections=50, keepalive_expiry=60.0),
+    timeout=30.0
+)
+atexit.register(_session.close)
+
 # 创建 Blueprint
 oai_bp = Blueprint('oai', __name__)
 
@@ -34,7 +44,7 @@ def serve_index():
 def get_token():
     try:
         # 请求OpenAI的ephemeral token
-        response = requests.post(
+        response = _session.post(
             'https://api.openai.com/v1/realtime/sessions',
             headers={
                 'Authorization': f'Bearer {api_key}',
@@ -52,7 +62,7 @@ def get_token():
         # 直接返回OpenAI的响应
         return jsonify(data)
     except Exception as e:
-        logger.error(f'Error getting token: {str(e)}')
+        logger.error('Error getting token: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @oai_bp.route('/process_command', methods=['POST'])
@@ -63,12 +73,12 @@ def process_command():
         if not command:
             return jsonify({'error': 'No command provided'}), 400
 
-        logger.info(f'Received command: {command}')
+        logger.info('Received command: %.120s', command)
         # 这里可以调用app.py中的相应功能来处理命令
         # TODO: 集成你的Ticktick功能处理逻辑
         
         return jsonify({'status': 'success', 'message': f'Processing command: {command}'})
     except Exception as e:
-        logger.error(f'Error processing command: {str(e)}')
+        logger.error('Error processing command: %s', e)
         return jsonify({'error': 'Failed to process command'}), 500
 
@@ -0,0 +1,22 @@
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+class PromptCachingChatCompletionClient(OpenAIChatCompletionClient):
+    """在系统提示上添加 cache_control 断点的模型客户端
+
+    OpenRouter 上的 Anthropic 模型只有带 cache_control 标记的内容才会进入提示缓存。
+    系统提示以逐字节不变的 STATIC_INSTRUCTIONS 开头，在其末尾设置断点后，
+    同一系统提示的后续请求直接命中缓存，只有新增的对话按全价计费。
+    """
+
+    def _process_create_args(self, *args, **kwargs):
+        params = super()._process_create_args(*args, **kwargs)
+        # 消息字典每次请求都重新生成，可以直接修改
+        for message in params.messages:
+            if message["role"] == "system" and isinstance(message.get("content"), str):
+                message["content"] = [{
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }]
+                break
+        return params
@@ -1,10 +1,14 @@
+import asyncio
 import logging
-from typing import Optional, Tuple
-from server.audio_processor import AudioProcessor
-from server.agent_strategy import create_agent_strategy, AgentStrategy
+from functools import cached_property
+from typing import Awaitable, Callable, Optional, Tuple
+from server.agent_strategy import acquire_agent_strategy, release_agent_strategy, AgentStrategy
 
 logger = logging.getLogger(__name__)
 
+# 音频消息以 data URL 形式发送
+_DATA_PREFIX = "data:"
+
 class SessionHandler:
     def __init__(self, use_direct_agent=False):
         """
@@ -13,44 +17,76 @@ class SessionHandler:
         Args:
             use_direct_agent (bool): 是否使用直接代理交互模式，默认为False（使用团队模式）
         """
-        self.audio_processor = AudioProcessor()
-        # 使用工厂函数创建适当的策略
-        self.strategy: AgentStrategy = create_agent_strategy(use_direct_agent)
+        self.use_direct_agent = use_direct_agent
+        # 优先复用之前连接释放的策略，没有时再新建
+        self.strategy: AgentStrategy = acquire_agent_strategy(use_direct_agent)
+        # 上一条消息处理完成的信号，用于在并发处理时保持消息顺序
+        self._last_turn: Optional[asyncio.Event] = None
     
+    @cached_property
+    def audio_processor(self):
+        """音频处理器，收到第一条音频消息时才导入并创建，纯文本会话无需加载 openai"""
+        from server.audio_processor import AudioProcessor
+        return AudioProcessor()
+
     async def initialize(self):
         """初始化会话，创建代理和团队"""
         await self.strategy.initialize()
+
+    async def close(self):
+        """连接结束时调用，重置策略并放回池中供新连接复用"""
+        await release_agent_strategy(self.strategy, self.use_direct_agent)
     
-    async def handle_message(self, data: str) -> Tuple[Optional[str], Optional[str]]:
+    async def handle_message(
+        self, data: str, on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
         """
         处理来自客户端的消息
+
+        可以并发调用：音频转录立即开始，与前面消息的推理重叠进行；
+        交给代理处理以及返回结果仍严格按调用顺序。
         
         Args:
             data (str): 客户端发送的数据
+            on_partial (Callable, optional): 中间消息回调，推理过程中逐条推送输出
             
         Returns:
             tuple: (status, message) 状态和消息内容
         """
+        # 空消息无需转录也无需交给代理，直接忽略
+        if not data:
+            return None, None
+
+        previous, turn = self._last_turn, asyncio.Event()
+        self._last_turn = turn
         try:
-            # 处理输入数据
-            if data.startswith('data:'):
-                # 处理音频数据
-                text = self.audio_processor.process_audio(data)
-            else:
-                # 直接处理文本数据
-                text = data
-                logger.info(f"Received text data: {text}")
-
-            if text is None or text == "":
+            try:
+                # 处理输入数据
+                if data.startswith(_DATA_PREFIX):
+                    # 处理音频数据
+                    text = await self.audio_processor.process_audio(data)
+                else:
+                    # 直接处理文本数据
+                    text = data
+                    logger.debug("Received text data: %s", text)
+            finally:
+                # 等待上一条消息处理完毕再继续，出错时也一样，保证结果按到达顺序返回
+                if previous is not None:
+                    await previous.wait()
+
+            # 文本消息已确认非空，只有转录结果可能为空
+            if not text:
                 return None, None
 
             # 使用策略处理消息
-            return await self.strategy.process_message(text)
+            return await self.strategy.process_message(text, on_partial)
                 
         except Exception as e:
             error_msg = f"Error processing request: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return "error", error_msg
+        finally:
+            turn.set()
     
     @property
     def history_digest(self) -> str:
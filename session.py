@@ -1,46 +1,132 @@
+import io
 import asyncio
 import logging
-from typing import Optional, Any
-from enum import Enum
+from typing import TYPE_CHECKING, Awaitable, Callable, ClassVar, Optional
+from dataclasses import dataclass
 from autogen_core import CancellationToken
 
-from pydantic import InstanceOf
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.ui._console import Console
-from autogen_agentchat.teams._group_chat._base_group_chat import BaseGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.base import Response, TaskResult
-from autogen_agentchat.messages import (
-    AgentEvent,
-    ChatMessage,
-    ModelClientStreamingChunkEvent,
-    MultiModalMessage,
-    UserInputRequestedEvent,
-)
-
-class SessionResult(Enum):
-    USER_INPUT_REQUESTED = "user_input_requested"
-    FINISHED = "finished"
-
-    def __init__(self, status: str):
-        self.status = status
-        self.last_message: Optional[str] = None
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import TextMessage, UserInputRequestedEvent
+
+from clients.model_cache import get_llm_cache, make_cache_key, model_name
+
+if TYPE_CHECKING:
+    # 仅用于类型注解，运行时不导入团队实现和 OpenAI 模型客户端
+    from autogen_agentchat.teams._group_chat._base_group_chat import BaseGroupChat
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+_SUMMARIZER_SYSTEM_MESSAGE = "你是一个专门负责总结对话的助手。你的任务是提取对话中的关键信息，并以列表形式返回重要的要点。"
+
+@dataclass(frozen=True, slots=True)
+class SessionResult:
+    """Result of one run_until_stop call. A fresh instance is returned per call."""
+
+    USER_INPUT_REQUESTED: ClassVar[str] = "user_input_requested"
+    FINISHED: ClassVar[str] = "finished"
+
+    status: str
+    last_message: Optional[str] = None
+
+# 会结束 run_until_stop 的消息类型及对应的状态。流中的其他消息（如流式分片）只需一次字典查找即可跳过
+_STOP_STATUSES = {
+    UserInputRequestedEvent: SessionResult.USER_INPUT_REQUESTED,
+    TaskResult: SessionResult.FINISHED,
+}
+
+class Summarizer:
+    """带缓存的对话摘要生成器，团队会话和直接模式共用
+
+    总结专用的 agent 只创建一次，每次使用前清空上下文；相同的输入直接返回缓存的摘要。
+    """
+
+    def __init__(self, model_client: "OpenAIChatCompletionClient"):
+        """
+        Args:
+            model_client: 生成摘要使用的模型客户端
+        """
+        self._model_client = model_client
+        self._agent: Optional[AssistantAgent] = None
+
+    async def summarize(self, history_text: str, previous_summary: str = "") -> str:
+        """
+        总结对话历史
+
+        Args:
+            history_text (str): 带编号的对话文本
+            previous_summary (str): 之前的摘要；非空时只需把 history_text 合并进去
+
+        Returns:
+            str: 摘要文本
+        """
+        if previous_summary:
+            summary_prompt = (
+                f"之前的摘要：\n{previous_summary}\n\n"
+                f"新增的对话：\n{history_text}\n\n"
+                "请将新增的对话合并到之前的摘要中，输出更新后的关键点列表，"
+                "重点保留用户的意图和重要信息。"
+            )
+        else:
+            summary_prompt = (
+                "请将以下对话历史总结为简明的关键点列表，"
+                "重点保留用户的意图和重要信息：\n\n"
+                f"{history_text}\n\n"
+            )
+
+        # 相同的输入直接返回缓存的摘要
+        cache = get_llm_cache()
+        key = make_cache_key(
+            model_name(self._model_client),
+            [("system", _SUMMARIZER_SYSTEM_MESSAGE), ("user", summary_prompt)]
+        )
+        # SQLite 读写在线程中执行，不阻塞事件循环
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+
+        # 每次使用前清空上下文，避免上一次的对话混入
+        if self._agent is None:
+            self._agent = AssistantAgent(
+                name="Summarizer",
+                system_message=_SUMMARIZER_SYSTEM_MESSAGE,
+                model_client=self._model_client
+            )
+        else:
+            await self._agent.on_reset(CancellationToken())
+
+        response = await self._agent.on_messages(
+            [TextMessage(content=summary_prompt, source="user")],
+            CancellationToken()
+        )
+        digest = response.chat_message.content
+        await asyncio.to_thread(cache.set, key, digest)
+        return digest
 
 class Session:
-    def __init__(self, team: BaseGroupChat, model_client:OpenAIChatCompletionClient):
+    def __init__(
+        self,
+        team: "BaseGroupChat",
+        model_client: "OpenAIChatCompletionClient",
+        summarizer: Optional[Summarizer] = None,
+    ):
         """
         Initialize Session class.
         
         Args:
             team: Chat team instance (e.g., MagenticOneGroupChat).
             model_client: Model client for chat.
+            summarizer: Summarizer shared across sessions; created on first digest() if omitted.
         """
         self._team = team
         self._model_client = model_client
         self._stream = None  # Current conversation stream
         self._task = None  # Async task for executing the stream
-        self._input_queue = asyncio.Queue()  # Create input queue
-        self._text_history = []  # List to store (content, source) tuples
+        self._contents: list[str] = []  # Message contents, parallel to _sources
+        self._sources: list[str] = []  # Message sources, parallel to _contents
+        self._history_snapshot: Optional[tuple[tuple[str, str], ...]] = None  # Cached get_history() result
+        self._formatted = io.StringIO()  # Numbered "i. [source] content" lines, appended as messages arrive
+        self._summary_cache: tuple[int, str] = (0, "")  # (offset into _formatted already summarized, summary)
+        self._summarizer = summarizer
         self._is_finished = False  # Add finished state flag
 
     @property
@@ -63,34 +149,52 @@ class Session:
         self._stream = self._team.run_stream(task=text)
         self._is_finished = False  # Reset finished state when starting new session
 
-    def get_history(self) -> list[str]:
+    def get_history(self) -> tuple[tuple[str, str], ...]:
         """Get the conversation history.
 
         Returns:
-            list[str]: List of messages in the conversation history.
+            tuple[tuple[str, str], ...]: Read-only snapshot of (content, source) pairs.
+                The snapshot is cached and rebuilt only after new messages arrive.
+        """
+        if self._history_snapshot is None:
+            self._history_snapshot = tuple(zip(self._contents, self._sources))
+        return self._history_snapshot
+
+    async def run_until_stop(
+        self, on_message: Optional[Callable[[str, str], Awaitable[None]]] = None
+    ) -> SessionResult:
         """
-        return self._text_history.copy()
+        Consume the stream until user input is requested or the task finishes.
 
-    async def run_until_stop(self) -> SessionResult:
-        result = SessionResult.USER_INPUT_REQUESTED
+        Args:
+            on_message: Optional async callback invoked with (content, source) for each
+                text message as soon as it arrives, so callers can stream partial output.
+        """
+        status = SessionResult.USER_INPUT_REQUESTED
 
         async for message in self._stream:
-            if isinstance(message, TextMessage):
-                self._text_history.append((message.content, message.source))
-
-            elif isinstance(message, UserInputRequestedEvent):
-                result = SessionResult.USER_INPUT_REQUESTED
+            message_type = type(message)
+            if message_type is TextMessage:
+                self._contents.append(message.content)
+                self._sources.append(message.source)
+                self._formatted.write(f"{len(self._contents)}. [{message.source}] {message.content}\n")
+                self._history_snapshot = None
+                if on_message:
+                    await on_message(message.content, message.source)
+                continue
+
+            stop_status = _STOP_STATUSES.get(message_type)
+            if stop_status is not None:
+                status = stop_status
+                self._is_finished = status == SessionResult.FINISHED
                 break
 
-            elif isinstance(message, TaskResult):
-                result = SessionResult.FINISHED
-                self._is_finished = True
-                break
-        
-        if self._text_history:
-            result.last_message = self._text_history[-1][0]  # Get content from the tuple
+        if self._is_finished:
+            # TaskResult 是流的最后一项，但生成器停在 yield 处时团队仍处于运行状态，
+            # 关闭生成器让其 finally 执行完毕，之后才能 reset() 或开始新的任务
+            await self._stream.aclose()
 
-        return result
+        return SessionResult(status, self._contents[-1] if self._contents else None)
 
     async def digest(self) -> list[str]:
         """
@@ -100,31 +204,20 @@ class Session:
             list[str]: 包含关键点的摘要列表。
         """
         # 检查历史记录是否为空
-        if not self._text_history:
+        if not self._contents:
             return ["没有可用的对话历史。"]
 
-        from autogen_agentchat.agents import AssistantAgent
-
-        # 创建总结专用的agent
-        summarizer = AssistantAgent(
-            name="Summarizer",
-            system_message="你是一个专门负责总结对话的助手。你的任务是提取对话中的关键信息，并以列表形式返回重要的要点。",
-            model_client=self._model_client
-        )
-
-        # 将历史记录格式化为带编号的文本
-        history_text = "\n".join([f"{i+1}. [{msg[1]}] {msg[0]}" for i, msg in enumerate(self._text_history)])
-        summary_prompt = (
-            "请将以下对话历史总结为简明的关键点列表，"
-            "重点保留用户的意图和重要信息：\n\n"
-            f"{history_text}\n\n"
-        )
-
-        # 使用总结agent生成摘要
-        response = await summarizer.on_messages(
-            [TextMessage(content=summary_prompt, source="user")],
-            CancellationToken()
-        )
-        
-        # 返回摘要文本
-        return response.chat_message.content
+        # 只总结上次摘要之后新增的消息，没有新消息时直接返回上次的摘要
+        summarized, previous_summary = self._summary_cache
+        total = self._formatted.tell()
+        if total == summarized:
+            return previous_summary
+
+        # 带编号的文本在消息到达时已写入缓冲区，这里只读取新增部分（去掉末尾换行）
+        self._formatted.seek(summarized)
+        history_text = self._formatted.read()[:-1]
+        if self._summarizer is None:
+            self._summarizer = Summarizer(self._model_client)
+        digest = await self._summarizer.summarize(history_text, previous_summary)
+        self._summary_cache = (total, digest)
+        return digest
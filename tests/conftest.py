@@ -0,0 +1,134 @@
+import itertools
+import json
+import re
+
+import httpx
+import pytest
+import respx
+
+TICKTICK_BASE_URL = 'https://api.ticktick.com/open/v1'
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--live', action='store_true', default=False,
+        help='对真实的 TickTick API 运行测试（默认使用内存中的模拟服务）'
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """带 --live 运行时，使用 TickTick API 的测试会访问真实账号，标记为 integration
+
+    在按 -m 筛选之前执行，因此 ``--live -m "not integration"`` 仍会跳过它们。
+    """
+    if not config.getoption('--live'):
+        return
+    for item in items:
+        if 'ticktick_api' in item.fixturenames:
+            item.add_marker(pytest.mark.integration)
+
+
+class FakeTickTickAPI:
+    """内存中的 TickTick Open API，用 respx 拦截客户端发出的 HTTP 请求
+
+    只实现 TickTickClient 用到的接口；项目和任务保存在字典中，
+    行为（字段回显、404、完成后不再出现在项目数据中）与真实接口一致。
+    """
+
+    def __init__(self, base_url: str = TICKTICK_BASE_URL):
+        self.projects = {}
+        self.tasks = {}
+        self._ids = itertools.count(1)
+        self.router = respx.mock(assert_all_called=False)
+
+        base = re.escape(base_url)
+        project = rf'{base}/project/(?P<project_id>[^/]+)'
+        task = rf'{project}/task/(?P<task_id>[^/]+)'
+        self.router.get(url=f'{base_url}/project').mock(side_effect=self._list_projects)
+        self.router.post(url=f'{base_url}/project').mock(side_effect=self._create_project)
+        self.router.delete(url__regex=rf'{project}$').mock(side_effect=self._delete_project)
+        self.router.get(url__regex=rf'{project}/data$').mock(side_effect=self._project_data)
+        self.router.get(url__regex=rf'{task}$').mock(side_effect=self._get_task)
+        self.router.delete(url__regex=rf'{task}$').mock(side_effect=self._delete_task)
+        self.router.post(url__regex=rf'{task}/complete$').mock(side_effect=self._complete_task)
+        self.router.post(url=f'{base_url}/task').mock(side_effect=self._create_task)
+        self.router.post(url__regex=rf'{base}/task/(?P<task_id>[^/]+)$').mock(side_effect=self._update_task)
+
+        # 收件箱总是存在
+        self.projects['inbox'] = {'id': 'inbox', 'name': 'Inbox', 'kind': 'INBOX'}
+
+    def __enter__(self):
+        self.router.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.router.stop()
+
+    def _new_id(self) -> str:
+        return f'{next(self._ids):024x}'
+
+    def _list_projects(self, request):
+        return httpx.Response(200, json=list(self.projects.values()))
+
+    def _create_project(self, request):
+        project = {**json.loads(request.content), 'id': self._new_id()}
+        self.projects[project['id']] = project
+        return httpx.Response(200, json=project)
+
+    def _delete_project(self, request, project_id):
+        if self.projects.pop(project_id, None) is None:
+            return httpx.Response(404)
+        self.tasks = {
+            task_id: task for task_id, task in self.tasks.items() if task['projectId'] != project_id
+        }
+        return httpx.Response(200)
+
+    def _project_data(self, request, project_id):
+        if project_id not in self.projects:
+            return httpx.Response(404)
+        tasks = [
+            t for t in self.tasks.values()
+            if t['projectId'] == project_id and t['status'] == 0
+        ]
+        return httpx.Response(200, json={'project': self.projects[project_id], 'tasks': tasks})
+
+    def _get_task(self, request, project_id, task_id):
+        task = self.tasks.get(task_id)
+        if task is None or task['projectId'] != project_id:
+            return httpx.Response(404)
+        return httpx.Response(200, json=task)
+
+    def _delete_task(self, request, project_id, task_id):
+        if self.tasks.pop(task_id, None) is None:
+            return httpx.Response(404)
+        return httpx.Response(200)
+
+    def _complete_task(self, request, project_id, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return httpx.Response(404)
+        task['status'] = 2
+        return httpx.Response(200)
+
+    def _create_task(self, request):
+        task = {**json.loads(request.content), 'id': self._new_id(), 'status': 0}
+        self.tasks[task['id']] = task
+        return httpx.Response(200, json=task)
+
+    def _update_task(self, request, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return httpx.Response(404)
+        task.update(json.loads(request.content))
+        return httpx.Response(200, json=task)
+
+
+@pytest.fixture(scope='module')
+def ticktick_api(request):
+    """模拟的 TickTick API；带 ``--live`` 运行时返回 None，请求发往真实服务"""
+    if request.config.getoption('--live'):
+        yield None
+        return
+    with FakeTickTickAPI() as api:
+        yield api
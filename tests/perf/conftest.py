@@ -0,0 +1,10 @@
+import asyncio
+
+import pytest
+
+@pytest.fixture(scope="module")
+def bench_loop():
+    """基准测试在同一个事件循环中反复执行协程，不把创建事件循环的开销计入结果"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -0,0 +1,47 @@
+"""Session.digest 的性能基准
+
+摘要结果来自桩缓存，测的是拼接历史、构造提示词和计算缓存键的本地开销。
+运行方式见 test_list_tasks_bench.py。
+"""
+import pytest
+from autogen_agentchat.messages import TextMessage
+
+import session as session_module
+from session import Session
+
+MESSAGE_COUNT = 200
+
+
+class _HitCache:
+    """总是命中的缓存，digest 不会请求模型"""
+
+    def get(self, key):
+        return "- 摘要"
+
+    def set(self, key, value):
+        pass
+
+
+@pytest.fixture
+def session(bench_loop, monkeypatch):
+    """已记录 MESSAGE_COUNT 条消息的会话"""
+    monkeypatch.setattr(session_module, "get_llm_cache", lambda: _HitCache())
+
+    async def stream():
+        for i in range(MESSAGE_COUNT):
+            source = "user" if i % 2 == 0 else "assistant"
+            yield TextMessage(content=f"第 {i} 条消息：" + "内容" * 50, source=source)
+
+    session = Session(team=None, model_client=None)
+    session._stream = stream()
+    bench_loop.run_until_complete(session.run_until_stop())
+    return session
+
+
+def test_digest(benchmark, bench_loop, session):
+    def run():
+        # 每轮都从头总结，而不是直接返回上次的摘要
+        session._summary_cache = (0, "")
+        return bench_loop.run_until_complete(session.digest())
+
+    assert benchmark(run) == "- 摘要"
@@ -0,0 +1,52 @@
+"""TaskManager.list_tasks 的性能基准
+
+基准测试在 xdist 下会被自动禁用，需要单进程运行并与上次结果比较：
+
+    pytest tests/perf -n 0 --benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from tools.ticktick import TaskManager
+
+TASK_COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def inbox_tasks():
+    """1000 个字段齐全程度不一的 Inbox 任务"""
+    tasks = []
+    for i in range(TASK_COUNT):
+        task = {
+            'id': f'{i:024x}',
+            'title': f'任务 {i}',
+            'priority': (0, 1, 3, 5)[i % 4],
+            'status': 2 if i % 7 == 0 else 0,
+        }
+        if i % 2:
+            task['content'] = f'任务 {i} 的详细说明'
+            task['dueDate'] = '2025-01-01T00:00:00.000+0000'
+        if i % 3 == 0:
+            task['startDate'] = '2024-12-31T00:00:00.000+0000'
+        if i % 5 == 0:
+            task['items'] = [
+                {'title': f'子任务 {i}-{j}', 'status': 2 if j == 0 else 0}
+                for j in range(3)
+            ]
+        tasks.append(task)
+    return tasks
+
+
+@pytest.fixture
+def task_manager(inbox_tasks):
+    """不做认证的 TaskManager，客户端直接返回固定的 Inbox 任务"""
+    task_manager = TaskManager.__new__(TaskManager)
+    task_manager.client = SimpleNamespace(get_inbox_tasks=lambda: inbox_tasks)
+    return task_manager
+
+
+def test_list_tasks(benchmark, bench_loop, task_manager):
+    markdown = benchmark(lambda: bench_loop.run_until_complete(task_manager.list_tasks()))
+    assert markdown.startswith("# Inbox Tasks")
+    assert markdown.count("\n## ") == TASK_COUNT
@@ -0,0 +1,109 @@
+import pytest
+from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
+from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+import session
+from clients.model_cache import LLMCache
+from server.agent_manager import UserInputHelper
+import server.agent_strategy
+from server.agent_strategy import (
+    DirectAgentStrategy,
+    TeamAgentStrategy,
+    acquire_agent_strategy,
+    release_agent_strategy,
+)
+from session import Session, SessionResult, Summarizer
+
+@pytest.fixture
+def agent_env(monkeypatch):
+    """AgentManager 构造时检查的环境变量"""
+    for name in ("OPENAI_API_KEY", "TICKTICK_CLIENT_ID", "TICKTICK_CLIENT_SECRET"):
+        monkeypatch.setenv(name, "test")
+
+@pytest.fixture
+def team_strategy(agent_env, monkeypatch, tmp_path):
+    """使用回放模型客户端的团队策略，不访问模型服务和 TickTick"""
+    # 摘要缓存写到临时目录，避免不同测试之间命中彼此的结果
+    cache = LLMCache(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(session, "get_llm_cache", lambda: cache)
+
+    model_client = ReplayChatCompletionClient([
+        "你好，有什么可以帮你？",
+        "好的，goodbye",
+        "- 用户打了招呼",
+        "又见面了，有什么可以帮你？",
+    ])
+    user_input_helper = UserInputHelper()
+    assistant = AssistantAgent(name="task_assistant", model_client=model_client)
+    user_proxy = UserProxyAgent(name="user", input_func=user_input_helper.get_user_input_func())
+    team = RoundRobinGroupChat(
+        [assistant, user_proxy], termination_condition=TextMentionTermination("goodbye")
+    )
+
+    strategy = TeamAgentStrategy()
+    strategy.team = team
+    strategy.model_client = model_client
+    strategy.summarizer = Summarizer(model_client)
+    strategy.session = Session(team, model_client, strategy.summarizer)
+    strategy.user_input_helper = user_input_helper
+    return strategy
+
+@pytest.mark.asyncio
+async def test_team_strategy_restarts_after_finish(team_strategy):
+    """对话结束后生成摘要并重置团队，下一条消息开始新的对话"""
+    status, message = await team_strategy.process_message("你好")
+    assert status == SessionResult.USER_INPUT_REQUESTED
+    assert message == "你好，有什么可以帮你？"
+
+    status, digest = await team_strategy.process_message("没事了")
+    assert status == SessionResult.FINISHED
+    assert digest == "- 用户打了招呼"
+    assert team_strategy.history_digest == digest
+
+    status, message = await team_strategy.process_message("我又来了")
+    assert status == SessionResult.USER_INPUT_REQUESTED
+    assert message == "又见面了，有什么可以帮你？"
+    # 重置后的新会话沿用同一个摘要生成器
+    assert team_strategy.session._summarizer is team_strategy.summarizer
+
+@pytest.mark.asyncio
+async def test_finished_team_strategy_is_recycled(team_strategy, monkeypatch):
+    """结束过对话的团队策略可以清空状态放回池中，交给下一个连接继续使用"""
+    monkeypatch.setattr(server.agent_strategy, "_STRATEGY_POOL", {True: [], False: []})
+
+    await team_strategy.process_message("你好")
+    status, _ = await team_strategy.process_message("没事了")
+    assert status == SessionResult.FINISHED
+
+    await release_agent_strategy(team_strategy)
+    strategy = acquire_agent_strategy()
+    assert strategy is team_strategy
+    assert strategy.history_digest == ""
+
+    status, message = await strategy.process_message("我又来了")
+    assert status == SessionResult.USER_INPUT_REQUESTED
+    assert message == "又见面了，有什么可以帮你？"
+
+@pytest.mark.asyncio
+async def test_direct_strategy_survives_failed_digest(agent_env):
+    """后台摘要生成失败只记录日志，不影响之后的消息"""
+    strategy = DirectAgentStrategy()
+    strategy.agent_manager.assistant = AssistantAgent(
+        name="task_assistant",
+        model_client=ReplayChatCompletionClient(["好的，再见", "我在", "还在"]),
+    )
+
+    async def failing_digest():
+        raise RuntimeError("summarizer unavailable")
+    strategy.agent_manager.generate_digest = failing_digest
+
+    status, _ = await strategy.process_message("没事了")
+    assert status == SessionResult.FINISHED
+
+    for expected in ("我在", "还在"):
+        status, message = await strategy.process_message("你还在吗")
+        assert status == SessionResult.USER_INPUT_REQUESTED
+        assert message == expected
+    assert strategy.history_digest == ""
@@ -0,0 +1,29 @@
+import asyncio
+import json
+
+from server.app import MAX_BATCH_SIZE, drain_batch
+
+def _outbox(*messages):
+    outbox = asyncio.Queue()
+    for message in messages:
+        outbox.put_nowait(message)
+    return outbox
+
+def test_drain_batch_merges_ready_messages():
+    """已就绪的消息合并为一个 multi 帧"""
+    frame, carry = drain_batch(_outbox("[partial] b", "[status] c"), "[partial] a")
+    assert json.loads(frame) == {"type": "multi", "payload": ["[partial] a", "[partial] b", "[status] c"]}
+    assert carry is None
+
+def test_drain_batch_holds_back_message_that_would_exceed_limit():
+    """放不下的消息不并入当前帧，而是交给下一帧"""
+    large = "x" * MAX_BATCH_SIZE
+    outbox = _outbox(large, "[status] done")
+    frame, carry = drain_batch(outbox, "[partial] a")
+    assert frame == "[partial] a"
+    assert carry == large
+
+    # 超过上限的单条消息单独成帧，其后的消息留到下一帧
+    frame, carry = drain_batch(outbox, carry)
+    assert frame == large
+    assert carry == "[status] done"
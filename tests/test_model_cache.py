@@ -0,0 +1,16 @@
+from clients.model_cache import LLMCache
+
+def test_cache_keeps_only_newest_entries(tmp_path):
+    """超出数量上限时删除最早写入的条目"""
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    for i in range(3):
+        cache.set(f"key{i}", f"value{i}")
+    assert cache.get("key0") is None
+    assert cache.get("key1") == "value1"
+    assert cache.get("key2") == "value2"
+
+def test_expired_entries_are_misses(tmp_path):
+    """过期的条目视为未命中"""
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    cache.set("key", "value")
+    assert cache.get("key") is None
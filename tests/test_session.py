@@ -4,20 +4,24 @@ import asyncio
 from dotenv import load_dotenv
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
-from session import Session, ConsoleHandler, SessionResult
-from autogen_agentchat.teams import MagenticOneGroupChat, RoundRobinGroupChat
-from autogen_agentchat.base import TaskResult
-from autogen_agentchat.ui import Console
+from session import Session, SessionResult
+from clients.model_cache import cached_model_client
+from autogen_agentchat.teams import MagenticOneGroupChat
 # Load environment variables
 load_dotenv()
 
-@pytest.fixture
+# 所有测试共用会话级的事件循环，才能复用会话级模型客户端的连接池
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio(loop_scope="session")]
+
+@pytest.fixture(scope="session")
 def model_client():
+    """整个测试会话共用一个模型客户端及其 HTTP 连接池；客户端本身不保存对话状态"""
     api_key = os.getenv("CEREBRAS_API_KEY")
     if not api_key:
         pytest.skip("CEREBRAS_API_KEY not found in environment variables")
     
-    return OpenAIChatCompletionClient(
+    # 重复运行时相同的请求直接读取磁盘缓存，不再请求模型
+    return cached_model_client(OpenAIChatCompletionClient(
         model="llama-3.3-70b",
         api_key=api_key,
         base_url="https://api.cerebras.ai/v1",
@@ -27,11 +31,7 @@ def model_client():
             "json_output": True,
             "family": "unknown",
         },
-        llm_config={
-            "cache_seed": 42,  # Enable caching with seed 42
-            "cache_path_root": ".cache/llm_cache"  # Specify cache directory
-        }
-    )
+    ))
 
 @pytest.fixture
 def assistant(model_client):
@@ -78,29 +78,21 @@ def user_proxy(user_input_queue):
         input_func=user_input_queue.get_user_input_func(),
     )
 
-@pytest.fixture
-def console_handler():
-    """创建控制台消息处理器"""
-    return ConsoleHandler()
-
 class TestSession:
-    @pytest.mark.asyncio
-    async def test_start_session(self, team, model_client, console_handler, user_input_queue):
+    async def test_start_session(self, team, model_client, user_input_queue):
         """测试开始新会话"""
         print("\n=== Testing Start Session ===\n")
         session = Session(team, model_client)
         
         # 启动会话
-        session.start("Help me solve a math problem", console_handler)
+        session.start("Help me solve a math problem")
         
         # 验证会话状态
         assert session.is_active == True
-        assert session.message_handler == console_handler
-        assert session.stream is not None
 
         # First run should request user input
         result = await session.run_until_stop()
-        assert result == SessionResult.USER_INPUT_REQUESTED
+        assert result.status == SessionResult.USER_INPUT_REQUESTED
         assert result.last_message is not None  # Should have some message content
 
         # Provide user input
@@ -108,23 +100,22 @@ class TestSession:
 
         # Second run should finish the conversation
         result = await session.run_until_stop()
-        assert result == SessionResult.FINISHED
+        assert result.status == SessionResult.FINISHED
         assert result.last_message is not None  # Should have the final response
         print(result.last_message)
 
-    @pytest.mark.asyncio
-    async def test_multiple_sessions(self, team, model_client, console_handler, user_input_queue):
+    async def test_multiple_sessions(self, team, model_client, user_input_queue):
         """测试多个会话串联执行，历史记录传递"""
         print("\n=== Testing Multiple Sessions ===\n")
         
         # First session
         session1 = Session(team, model_client)
         initial_prompt = "Help me solve a math problem"
-        session1.start(initial_prompt, console_handler)
+        session1.start(initial_prompt)
         
         # First session: Get initial response
         result = await session1.run_until_stop()
-        assert result == SessionResult.USER_INPUT_REQUESTED
+        assert result.status == SessionResult.USER_INPUT_REQUESTED
         first_response = result.last_message
         
         # First session: Provide user input
@@ -133,7 +124,7 @@ class TestSession:
         
         # First session: Get final response
         result = await session1.run_until_stop()
-        # assert result == SessionResult.FINISHED
+        # assert result.status == SessionResult.FINISHED
 
         # 获取第一轮对话的摘要
         first_round_digest = await session1.digest()
@@ -151,7 +142,7 @@ class TestSession:
         print("\nPrompt for second session:")
         print(prompt)
         
-        session2.start(prompt, console_handler)
+        session2.start(prompt)
         result = await session2.run_until_stop()
 
         print(f"session2 result: {result.last_message}")
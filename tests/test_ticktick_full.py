@@ -1,37 +1,50 @@
 import os
 import pytest
 from datetime import datetime, timedelta
-from clients.ticktick import TickTickClient
+from clients.ticktick import AsyncTickTickClient, TickTickClient
 from dotenv import load_dotenv
 
 @pytest.fixture(scope='module')
-def client():
-    """创建一个 TickTickClient 实例作为测试固件"""
+def client(ticktick_api):
+    """创建一个 TickTickClient 实例作为测试固件
+
+    默认连接内存中的模拟 API；``pytest --live`` 时使用真实账号（需要 .env 中的凭据）。
+    """
     load_dotenv()
     client = TickTickClient(
         client_id=os.getenv('TICKTICK_CLIENT_ID'),
         client_secret=os.getenv('TICKTICK_CLIENT_SECRET')
     )
-    if not client.access_token:
+    if ticktick_api is not None:
+        client.access_token = 'test-token'
+        client._refresh_token = None
+        client._update_auth_header()
+    elif not client.access_token:
         client.authenticate()
     return client
 
 @pytest.fixture(scope='module')
 def test_project(client):
-    """创建一个测试项目作为测试固件"""
+    """测试项目固件
+
+    账号中已有同名项目时直接复用，不再每次运行都新建一个；
+    设置 TICKTICK_CLEANUP=1 时测试结束后删除该项目。
+    """
     project_name = "测试项目"
-    project = client.create_project(
-        name=project_name,
-        color="#FF0000",  # 红色
-        view_mode="list"
-    )
+    project = next((p for p in client.get_projects() if p['name'] == project_name), None)
+    if project is None:
+        project = client.create_project(
+            name=project_name,
+            color="#FF0000",  # 红色
+            view_mode="list"
+        )
     yield project
     # 测试结束后清理项目
-    try:
-        # 这里需要实现删除项目的方法
-        pass
-    except Exception as e:
-        print(f"清理测试项目时出错: {e}")
+    if os.getenv('TICKTICK_CLEANUP') == '1':
+        try:
+            client.delete_project(project['id'])
+        except Exception as e:
+            print(f"清理测试项目时出错: {e}")
 
 def test_authentication(client):
     """测试认证功能"""
@@ -43,46 +56,52 @@ def test_create_project(test_project):
     assert test_project['color'] == "#FF0000", "项目颜色不匹配"
     assert test_project['viewMode'] == "list", "项目视图模式不匹配"
 
-def test_create_task(client, test_project):
-    """测试创建任务"""
-    # 创建一个普通任务
-    task1 = client.create_task(
-        title="测试任务1",
-        project_name=test_project['name'],
-        content="这是一个测试任务",
-        due_date=datetime.now().strftime('%Y-%m-%d'),
-        priority=3
-    )
+@pytest.mark.asyncio
+async def test_create_task(client, test_project):
+    """测试创建任务（三个任务互不依赖，并发创建）"""
+    tomorrow = datetime.now() + timedelta(days=1)
+    reminder_time = tomorrow.replace(hour=9, minute=0, second=0).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    task1, task2, task3 = await AsyncTickTickClient(client).create_tasks([
+        # 一个普通任务
+        dict(
+            title="测试任务1",
+            project_name=test_project['name'],
+            content="这是一个测试任务",
+            due_date=datetime.now().strftime('%Y-%m-%d'),
+            priority=3
+        ),
+        # 一个带提醒的任务
+        dict(
+            title="测试任务2（带提醒）",
+            project_name=test_project['name'],
+            content="这是一个带提醒的任务",
+            due_date=tomorrow.strftime('%Y-%m-%d'),
+            reminders=[reminder_time],
+            priority=5  # 高优先级
+        ),
+        # 一个重复任务
+        dict(
+            title="测试任务3（每周重复）",
+            project_name=test_project['name'],
+            content="这是一个每周重复的任务",
+            due_date=tomorrow.strftime('%Y-%m-%d'),
+            repeat={
+                'freq': 'WEEKLY',
+                'interval': 1,
+                'until': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+            }
+        ),
+    ])
+    for task in (task1, task2, task3):
+        assert not isinstance(task, Exception), f"创建任务失败: {task}"
+
     assert task1['title'] == "测试任务1", "任务标题不匹配"
     assert task1['priority'] == 3, "任务优先级不匹配"
 
-    # 创建一个带提醒的任务
-    tomorrow = datetime.now() + timedelta(days=1)
-    reminder_time = tomorrow.replace(hour=9, minute=0, second=0).strftime('%Y-%m-%dT%H:%M:%S.000Z')
-    task2 = client.create_task(
-        title="测试任务2（带提醒）",
-        project_name=test_project['name'],
-        content="这是一个带提醒的任务",
-        due_date=tomorrow.strftime('%Y-%m-%d'),
-        reminders=[reminder_time],
-        priority=5  # 高优先级
-    )
     assert task2['title'] == "测试任务2（带提醒）", "带提醒任务的标题不匹配"
     assert task2['priority'] == 5, "带提醒任务的优先级不匹配"
     # 暂时跳过提醒测试，因为 API 响应中可能不包含 reminders 字段
 
-    # 创建一个重复任务
-    task3 = client.create_task(
-        title="测试任务3（每周重复）",
-        project_name=test_project['name'],
-        content="这是一个每周重复的任务",
-        due_date=tomorrow.strftime('%Y-%m-%d'),
-        repeat={
-            'freq': 'WEEKLY',
-            'interval': 1,
-            'until': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-        }
-    )
     assert task3['title'] == "测试任务3（每周重复）", "重复任务的标题不匹配"
     assert task3.get('repeat') is not None, "任务的重复设置失败"
 
@@ -1,10 +1,6 @@
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.ui import Console
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_core import CancellationToken
 from clients.ticktick import TickTickClient
 import asyncio
+import threading
 from dotenv import load_dotenv
 import os
 
@@ -14,6 +10,9 @@ async def get_weather(city: str) -> str:
     """Get the weather for a given city."""
     return f"The weather in {city} is 73 degrees and Sunny."
 
+# 任务优先级对应的名称
+_PRIORITY_NAMES = {1: "Low", 3: "Medium", 5: "High"}
+
 class TaskManager:
     def __init__(self, client_id: str, client_secret: str):
         self.client = TickTickClient(client_id, client_secret)
@@ -54,14 +53,14 @@ class TaskManager:
         if not tasks:
             return "# Inbox Tasks\n\nNo tasks found."
             
-        markdown = "# Inbox Tasks\n\n"
+        parts = ["# Inbox Tasks\n\n"]
         
         for task in tasks:
             # 添加任务标题和内容
-            markdown += f"## {task['title']}\n\n"
+            parts.append(f"## {task['title']}\n\n")
             
             if task.get('content'):
-                markdown += f"{task['content']}\n\n"
+                parts.append(f"{task['content']}\n\n")
                 
             # 添加任务详情
             details = []
@@ -70,26 +69,26 @@ class TaskManager:
             if task.get('dueDate'):
                 details.append(f"- Due: {task['dueDate']}")
             if task.get('priority'):
-                priority_map = {1: "Low", 3: "Medium", 5: "High"}
-                details.append(f"- Priority: {priority_map.get(task['priority'], 'Normal')}")
+                details.append(f"- Priority: {_PRIORITY_NAMES.get(task['priority'], 'Normal')}")
             if task.get('status') is not None:
                 status = "Completed" if task['status'] == 2 else "In Progress"
                 details.append(f"- Status: {status}")
                 
             if details:
-                markdown += "\n".join(details) + "\n\n"
+                parts.append("\n".join(details) + "\n\n")
             
             # 添加子任务
             if task.get('items'):
-                markdown += "### Subtasks\n\n"
+                parts.append("### Subtasks\n\n")
                 for item in task['items']:
                     status_mark = "✓" if item.get('status') == 2 else "☐"
-                    markdown += f"- {status_mark} {item['title']}\n"
-                markdown += "\n"
+                    parts.append(f"- {status_mark} {item['title']}\n")
+                parts.append("\n")
             
-            markdown += "---\n\n"
+            parts.append("---\n\n")
             
-        return markdown.strip()
+        # 片段收集到列表中最后一次性拼接，避免逐段 += 反复复制整个字符串
+        return "".join(parts).strip()
 
     async def complete_task(self, task_id: str) -> None:
         """完成 Inbox 中的任务
@@ -130,7 +129,28 @@ class TaskManager:
         tasks = self.client.get_inbox_tasks(include_completed=True)
         return [task for task in tasks if task.get('status') == 2]
 
+# 按凭据缓存的 TaskManager，见 get_task_manager()
+_task_managers: dict[tuple[str, str], TaskManager] = {}
+_task_managers_lock = threading.Lock()
+
+def get_task_manager(client_id: str, client_secret: str) -> TaskManager:
+    """获取共享的 TaskManager 实例
+    
+    TaskManager 初始化时会加载令牌并完成认证，底层客户端还持有 HTTP 连接池和项目缓存。
+    按凭据复用同一个实例，避免每个连接重复认证并重新建立到 TickTick 的连接。
+    """
+    key = (client_id, client_secret)
+    with _task_managers_lock:
+        if key not in _task_managers:
+            _task_managers[key] = TaskManager(client_id, client_secret)
+        return _task_managers[key]
+
 async def main() -> None:
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_agentchat.messages import TextMessage
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from autogen_core import CancellationToken
+
     # Get the required environment variables
     api_key = os.getenv("OPENAI_API_KEY")
     ticktick_client_id = os.getenv("TICKTICK_CLIENT_ID")
@@ -141,11 +161,12 @@ async def main() -> None:
     if not ticktick_client_id or not ticktick_client_secret:
         raise ValueError("TICKTICK_CLIENT_ID and TICKTICK_CLIENT_SECRET environment variables must be set")
 
-    # Create the model client with API key
-    model_client = OpenAIChatCompletionClient(
+    # Create the model client with API key; repeated runs reuse cached completions
+    from clients.model_cache import cached_model_client
+    model_client = cached_model_client(OpenAIChatCompletionClient(
         model="gpt-4",
         api_key=api_key,
-    )
+    ))
     
     # Initialize task manager
     task_manager = TaskManager(ticktick_client_id, ticktick_client_secret)